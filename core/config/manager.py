@@ -1,8 +1,11 @@
 """
 Configuration manager for loading and managing application configuration
 """
-import json
 import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Dict, Any
 from loguru import logger
@@ -13,10 +16,27 @@ from .models import AppConfig, WorkerConfig, TaskConfig, PipelineConfig
 class ConfigManager:
     """Configuration manager"""
     
+    # Seconds to wait for further changes before writing the config file
+    save_delay = 0.05
+    # Seconds between attempts after a background write fails
+    save_retry_delay = 5.0
+    
     def __init__(self, config_path: str = "config.json"):
         self.config_path = Path(config_path)
         self._config: Optional[AppConfig] = None
         self._watchers = []
+        # (st_mtime_ns, st_size) of the file the current config was parsed from
+        self._cache_key: Optional[tuple] = None
+        # Held while the config is mutated or serialized, so a background
+        # save never sees a half-applied change
+        self._config_lock = threading.RLock()
+        # Coalesced writes for update_*/remove_* calls
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._batch_depth = 0
+        # Error from the last failed write, cleared by the next successful one
+        self.save_error: Optional[Exception] = None
     
     def load_config(self) -> AppConfig:
         """Load configuration from file"""
@@ -25,10 +45,16 @@ class ConfigManager:
                 logger.info(f"Config file {self.config_path} not found. Creating default config.")
                 self.create_default_config()
             
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            # Unchanged file, keep the already validated model
+            st = self.config_path.stat()
+            cache_key = (st.st_mtime_ns, st.st_size)
+            if self._config and cache_key == self._cache_key:
+                return self._config
             
-            self._config = AppConfig(**config_data)
+            # Parse bytes straight into the model without an intermediate dict
+            with open(self.config_path, 'rb') as f:
+                self._config = AppConfig.model_validate_json(f.read())
+            self._cache_key = cache_key
             logger.info(f"Configuration loaded from {self.config_path}")
             return self._config
             
@@ -36,6 +62,7 @@ class ConfigManager:
             logger.error(f"Failed to load config: {e}")
             logger.info("Using default configuration")
             self._config = AppConfig()
+            self._cache_key = None
             return self._config
     
     def save_config(self, config: Optional[AppConfig] = None) -> bool:
@@ -45,51 +72,138 @@ class ConfigManager:
             if not config:
                 raise ValueError("No configuration to save")
             
-            config_dict = config.model_dump(exclude_none=True)
+            # One write to a temp file beside the target, then an atomic rename,
+            # so a crash never leaves a truncated config behind
+            with self._config_lock:
+                data = config.model_dump_json(indent=2, exclude_none=True).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.config_path.parent, prefix=f".{self.config_path.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self.config_path.exists():
+                    shutil.copymode(self.config_path, tmp_path)
+                os.replace(tmp_path, self.config_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
             
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_dict, f, indent=2, ensure_ascii=False)
+            # The file now matches the in-memory model, no need to parse it back
+            if config is self._config:
+                st = self.config_path.stat()
+                self._cache_key = (st.st_mtime_ns, st.st_size)
             
+            self.save_error = None
             logger.info(f"Configuration saved to {self.config_path}")
             return True
             
         except Exception as e:
+            self.save_error = e
             logger.error(f"Failed to save config: {e}")
             return False
     
-    def create_default_config(self) -> AppConfig:
-        """Create and save default configuration"""
-        config = AppConfig()
-        
-        # Set some example tasks
-        config.worker.active_tasks = ["face_detection", "text_sentiment"]
-        config.worker.active_pipelines = ["image_processing_pipeline"]
+    def _schedule_save(self) -> bool:
+        """Mark the config dirty and write it once changes settle"""
+        with self._save_lock:
+            self._dirty = True
+            if self._batch_depth:
+                return True
+            self._start_save_timer(self.save_delay, daemon=False)
+        return True
+    
+    def _start_save_timer(self, delay: float, daemon: bool):
+        """Replace any pending save timer; caller holds _save_lock"""
+        if self._save_timer:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(delay, self._save_in_background)
+        self._save_timer.daemon = daemon
+        self._save_timer.start()
+    
+    def _save_in_background(self):
+        """Timer callback: flush, retrying later if the write fails"""
+        if self.flush():
+            return
+        with self._save_lock:
+            # Retries are daemon timers so a write that keeps failing
+            # cannot hold up interpreter exit
+            if self._dirty and not self._batch_depth and self._save_timer is None:
+                self._start_save_timer(self.save_retry_delay, daemon=True)
+    
+    def flush(self) -> bool:
+        """
+        Write pending configuration changes now
         
-        # Example task configs
-        config.worker.task_configs = {
-            "face_detection": TaskConfig(
-                task_id="face_detection",
-                queue="vision",
-                priority=7,
-                timeout=120
-            ),
-            "text_sentiment": TaskConfig(
-                task_id="text_sentiment",
-                queue="nlp",
-                priority=5,
-                timeout=60
-            )
-        }
+        Returns:
+            True if nothing was pending or the write succeeded. False if it
+            failed; save_error then holds the exception and the changes stay
+            pending for the next flush.
+        """
+        with self._save_lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            self._dirty = False
         
-        # Example pipeline config
-        config.worker.pipeline_configs = {
-            "image_processing_pipeline": PipelineConfig(
-                pipeline_id="image_processing_pipeline",
-                tasks=["face_detection", "object_detection"],
-                queue="pipeline",
-                parallel=False
-            )
-        }
+        if not self.save_config():
+            with self._save_lock:
+                self._dirty = True
+            return False
+        return True
+    
+    @contextmanager
+    def batch(self):
+        """Suspend autosave until the block exits, then write once"""
+        with self._save_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._save_lock:
+                self._batch_depth -= 1
+                done = self._batch_depth == 0
+            if done:
+                self.flush()
+    
+    def create_default_config(self) -> AppConfig:
+        """Create and save default configuration"""
+        # Built in one pass so the worker config is validated only once
+        config = AppConfig(worker=WorkerConfig(
+            # Some example tasks
+            active_tasks=["face_detection", "text_sentiment"],
+            active_pipelines=["image_processing_pipeline"],
+            
+            # Example task configs
+            task_configs={
+                "face_detection": TaskConfig(
+                    task_id="face_detection",
+                    queue="vision",
+                    priority=7,
+                    timeout=120
+                ),
+                "text_sentiment": TaskConfig(
+                    task_id="text_sentiment",
+                    queue="nlp",
+                    priority=5,
+                    timeout=60
+                )
+            },
+            
+            # Example pipeline config
+            pipeline_configs={
+                "image_processing_pipeline": PipelineConfig(
+                    pipeline_id="image_processing_pipeline",
+                    tasks=["face_detection", "object_detection"],
+                    queue="pipeline",
+                    parallel=False
+                )
+            }
+        ))
         
         self._config = config
         self.save_config(config)
@@ -103,72 +217,86 @@ class ConfigManager:
         return self._config
     
     def update_task_config(self, task_id: str, config: TaskConfig) -> bool:
-        """Update task configuration"""
+        """
+        Update task configuration
+        
+        Returns True once the change is applied in memory. The file is
+        written shortly after; call flush() to write it now and see
+        whether the write succeeded.
+        """
         try:
-            if not self._config:
-                self.load_config()
-            
-            self._config.worker.task_configs[task_id] = config
-            if task_id not in self._config.worker.active_tasks:
-                self._config.worker.active_tasks.append(task_id)
+            with self._config_lock:
+                if not self._config:
+                    self.load_config()
+                
+                self._config.worker.task_configs[task_id] = config
+                if task_id not in self._config.worker.active_tasks:
+                    self._config.worker.active_tasks.append(task_id)
             
-            return self.save_config()
+            return self._schedule_save()
             
         except Exception as e:
             logger.error(f"Failed to update task config {task_id}: {e}")
             return False
     
     def update_pipeline_config(self, pipeline_id: str, config: PipelineConfig) -> bool:
-        """Update pipeline configuration"""
+        """Update pipeline configuration, saved like update_task_config"""
         try:
-            if not self._config:
-                self.load_config()
+            with self._config_lock:
+                if not self._config:
+                    self.load_config()
+                
+                self._config.worker.pipeline_configs[pipeline_id] = config
+                if pipeline_id not in self._config.worker.active_pipelines:
+                    self._config.worker.active_pipelines.append(pipeline_id)
             
-            self._config.worker.pipeline_configs[pipeline_id] = config
-            if pipeline_id not in self._config.worker.active_pipelines:
-                self._config.worker.active_pipelines.append(pipeline_id)
-            
-            return self.save_config()
+            return self._schedule_save()
             
         except Exception as e:
             logger.error(f"Failed to update pipeline config {pipeline_id}: {e}")
             return False
     
     def remove_task(self, task_id: str) -> bool:
-        """Remove task from configuration"""
+        """Remove task from configuration, saved like update_task_config"""
         try:
-            if not self._config:
-                self.load_config()
-            
-            # Remove from active tasks
-            if task_id in self._config.worker.active_tasks:
-                self._config.worker.active_tasks.remove(task_id)
+            with self._config_lock:
+                if not self._config:
+                    self.load_config()
+                
+                # Remove from active tasks, a single scan of the list
+                try:
+                    self._config.worker.active_tasks.remove(task_id)
+                except ValueError:
+                    pass
+                
+                # Remove task config
+                if task_id in self._config.worker.task_configs:
+                    del self._config.worker.task_configs[task_id]
             
-            # Remove task config
-            if task_id in self._config.worker.task_configs:
-                del self._config.worker.task_configs[task_id]
-            
-            return self.save_config()
+            return self._schedule_save()
             
         except Exception as e:
             logger.error(f"Failed to remove task {task_id}: {e}")
             return False
     
     def remove_pipeline(self, pipeline_id: str) -> bool:
-        """Remove pipeline from configuration"""
+        """Remove pipeline from configuration, saved like update_task_config"""
         try:
-            if not self._config:
-                self.load_config()
-            
-            # Remove from active pipelines
-            if pipeline_id in self._config.worker.active_pipelines:
-                self._config.worker.active_pipelines.remove(pipeline_id)
+            with self._config_lock:
+                if not self._config:
+                    self.load_config()
+                
+                # Remove from active pipelines, a single scan of the list
+                try:
+                    self._config.worker.active_pipelines.remove(pipeline_id)
+                except ValueError:
+                    pass
+                
+                # Remove pipeline config
+                if pipeline_id in self._config.worker.pipeline_configs:
+                    del self._config.worker.pipeline_configs[pipeline_id]
             
-            # Remove pipeline config
-            if pipeline_id in self._config.worker.pipeline_configs:
-                del self._config.worker.pipeline_configs[pipeline_id]
-            
-            return self.save_config()
+            return self._schedule_save()
             
         except Exception as e:
             logger.error(f"Failed to remove pipeline {pipeline_id}: {e}")
@@ -188,7 +316,9 @@ class ConfigManager:
     
     def reload_config(self) -> AppConfig:
         """Reload configuration from file"""
+        self.flush()
         self._config = None
+        self._cache_key = None
         return self.load_config()
     
     def validate_config(self) -> bool:
@@ -197,21 +327,21 @@ class ConfigManager:
             if not self._config:
                 self.load_config()
             
+            worker = self._config.worker
+            task_ids = worker.task_configs.keys()
+            
             # Validate that active tasks have configs
-            for task_id in self._config.worker.active_tasks:
-                if task_id not in self._config.worker.task_configs:
-                    logger.warning(f"Active task {task_id} missing configuration")
+            for task_id in sorted(set(worker.active_tasks) - task_ids):
+                logger.warning(f"Active task {task_id} missing configuration")
             
             # Validate that active pipelines have configs
-            for pipeline_id in self._config.worker.active_pipelines:
-                if pipeline_id not in self._config.worker.pipeline_configs:
-                    logger.warning(f"Active pipeline {pipeline_id} missing configuration")
+            for pipeline_id in sorted(set(worker.active_pipelines) - worker.pipeline_configs.keys()):
+                logger.warning(f"Active pipeline {pipeline_id} missing configuration")
             
             # Validate pipeline task dependencies
-            for pipeline_id, pipeline_config in self._config.worker.pipeline_configs.items():
-                for task_id in pipeline_config.tasks:
-                    if task_id not in self._config.worker.task_configs:
-                        logger.warning(f"Pipeline {pipeline_id} references missing task {task_id}")
+            for pipeline_id, pipeline_config in worker.pipeline_configs.items():
+                for task_id in sorted(set(pipeline_config.tasks) - task_ids):
+                    logger.warning(f"Pipeline {pipeline_id} references missing task {task_id}")
             
             return True
             
@@ -1,11 +1,15 @@
 """
 Configuration models using Pydantic for validation
 """
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, validator
+from typing import List, Dict, Any, Optional, Set
+from pydantic import BaseModel, Field, field_validator
 from pathlib import Path
 
 
+# Cache directories already created by this process, so reloads skip the mkdir
+_ensured_dirs: Set[str] = set()
+
+
 class MongoDBConfig(BaseModel):
     """MongoDB configuration"""
     host: str = "localhost"
@@ -14,6 +18,22 @@ class MongoDBConfig(BaseModel):
     username: Optional[str] = None
     password: Optional[str] = None
     auth_source: str = "admin"
+    # Connection pool settings shared by every user of the client. Pool
+    # sizes default to values derived from worker.max_concurrent_tasks.
+    # Total server connections ~= max_pool_size x replica members x processes
+    max_pool_size: Optional[int] = None
+    min_pool_size: Optional[int] = None
+    max_idle_time_ms: int = 60000
+    socket_timeout_ms: int = 30000
+    connect_timeout_ms: int = 5000
+    wait_queue_timeout_ms: int = 10000
+    retry_writes: bool = True
+    retry_reads: bool = True  # retry a read once after a stepdown or dropped connection
+    # e.g. "zstd,snappy,zlib"; zstd and snappy need the pymongo[zstd,snappy] extras
+    compressors: Optional[str] = None
+    app_name: str = "worker-task-manager"  # shown in server logs and currentOp
+    # Opt-in: execution records older than this are removed by a TTL index
+    execution_retention_days: Optional[int] = None
     
     @property
     def connection_string(self) -> str:
@@ -30,6 +50,10 @@ class MinIOConfig(BaseModel):
     bucket: str = "ai-tasks"
     secure: bool = False
     region: Optional[str] = None
+    # HTTP connections kept per host; defaults to a value derived from worker.max_concurrent_tasks
+    max_pool_size: Optional[int] = None
+    connect_timeout: float = 10.0
+    read_timeout: float = 300.0
 
 
 class RedisConfig(BaseModel):
@@ -50,7 +74,7 @@ class CeleryConfig(BaseModel):
     """Celery configuration"""
     broker_url: Optional[str] = None
     result_backend: Optional[str] = None
-    task_serializer: str = "json"
+    task_serializer: str = "json"  # "orjson" when installed on producers and workers
     accept_content: List[str] = ["json"]
     result_serializer: str = "json"
     timezone: str = "UTC"
@@ -109,21 +133,25 @@ class WorkerConfig(BaseModel):
     pipeline_cache_dir: str = "./pipeline_cache"
     auto_update: bool = True
     max_concurrent_tasks: int = 5
+    cpu_affinity: Optional[str] = None  # e.g. "1,2,3-5" or "[0-7]:4"
     health_check_interval: int = 30
     log_level: str = "INFO"
     
-    @validator('task_cache_dir', 'pipeline_cache_dir')
+    @field_validator('task_cache_dir', 'pipeline_cache_dir')
+    @classmethod
     def validate_cache_dirs(cls, v):
-        path = Path(v)
-        path.mkdir(parents=True, exist_ok=True)
-        return str(path.absolute())
+        path = Path(v).absolute()
+        if str(path) not in _ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(str(path))
+        return str(path)
     
     def model_post_init(self, __context):
         """Post initialization to setup Celery URLs"""
-        if not self.celery.broker_url:
-            self.celery.broker_url = self.redis.connection_string
-        if not self.celery.result_backend:
-            self.celery.result_backend = self.redis.connection_string
+        if not (self.celery.broker_url and self.celery.result_backend):
+            redis_url = self.redis.connection_string
+            self.celery.broker_url = self.celery.broker_url or redis_url
+            self.celery.result_backend = self.celery.result_backend or redis_url
 
 
 class SystemConfig(BaseModel):
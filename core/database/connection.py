@@ -1,16 +1,69 @@
 """
 MongoDB connection management
 """
-from typing import Optional
-from pymongo import MongoClient
+import hashlib
+import threading
+from typing import Optional, Tuple
+from pymongo import IndexModel, MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
+from pymongo.write_concern import WriteConcern
 from loguru import logger
 
 from ..config.models import MongoDBConfig
 from ..config.manager import get_config
 
 
+# Collection holding internal bookkeeping documents
+META_COLLECTION = "meta"
+
+# Indexes per collection as (keys, unique)
+INDEX_SPECS = {
+    "task_metadata": [
+        ([("task_id", 1)], True),
+        ([("is_active", 1), ("created_at", -1)], False),
+        ([("category", 1)], False),
+        ([("tags", 1)], False),
+        ([("created_at", -1)], False),
+    ],
+    "pipeline_metadata": [
+        ([("pipeline_id", 1)], True),
+        ([("is_active", 1), ("created_at", -1)], False),
+        ([("category", 1)], False),
+        ([("tags", 1)], False),
+        ([("created_at", -1)], False),
+    ],
+    # Compound indexes match the filters used by list_execution_records and
+    # the statistics queries, which all sort or range on created_at
+    "execution_records": [
+        ([("execution_id", 1)], True),
+        ([("celery_task_id", 1)], True),
+        ([("task_id", 1), ("created_at", -1)], False),
+        ([("pipeline_id", 1), ("created_at", -1)], False),
+        ([("worker_id", 1), ("status", 1), ("created_at", -1)], False),
+        ([("status", 1), ("created_at", -1)], False),
+    ],
+    "worker_status": [
+        ([("worker_id", 1)], True),
+        ([("is_active", 1), ("last_heartbeat", -1)], False),
+    ],
+}
+
+# created_at index on execution_records, doubling as the retention TTL
+EXECUTION_TTL_INDEX = "ttl_created_at"
+
+# Indexes from earlier releases that INDEX_SPECS replaced, dropped on upgrade
+RETIRED_INDEXES = {
+    "task_metadata": ["is_active_1"],
+    "pipeline_metadata": ["is_active_1"],
+    "execution_records": [
+        "task_id_1", "pipeline_id_1", "worker_id_1", "status_1",
+        "started_at_-1", "completed_at_-1", "created_at_-1",
+    ],
+    "worker_status": ["is_active_1", "last_heartbeat_-1"],
+}
+
+
 class MongoDBConnection:
     """MongoDB connection manager"""
     
@@ -18,35 +71,64 @@ class MongoDBConnection:
         self.config = config or get_config().worker.mongodb
         self._client: Optional[MongoClient] = None
         self._database: Optional[Database] = None
+        self._lock = threading.Lock()
         
     def connect(self) -> bool:
-        """Establish MongoDB connection"""
-        try:
-            self._client = MongoClient(
-                self.config.connection_string,
-                serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000,
-                socketTimeoutMS=5000
-            )
+        """Establish MongoDB connection, reusing the existing client if any"""
+        with self._lock:
+            if self._client is not None:
+                return True
             
-            # Test connection
-            self._client.admin.command('ping')
-            self._database = self._client[self.config.database]
-            
-            logger.info(f"Connected to MongoDB: {self.config.host}:{self.config.port}/{self.config.database}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
-            return False
+            try:
+                max_pool_size, min_pool_size = self._pool_sizes()
+                options = {}
+                if self.config.compressors:
+                    options["compressors"] = self.config.compressors
+                
+                client = MongoClient(
+                    self.config.connection_string,
+                    serverSelectionTimeoutMS=5000,
+                    connectTimeoutMS=self.config.connect_timeout_ms,
+                    socketTimeoutMS=self.config.socket_timeout_ms,
+                    maxPoolSize=max_pool_size,
+                    minPoolSize=min_pool_size,
+                    maxIdleTimeMS=self.config.max_idle_time_ms,
+                    waitQueueTimeoutMS=self.config.wait_queue_timeout_ms,
+                    retryWrites=self.config.retry_writes,
+                    retryReads=self.config.retry_reads,
+                    appname=self.config.app_name,
+                    **options
+                )
+                
+                # Test connection
+                client.admin.command('ping')
+                self._database = client[self.config.database]
+                self._client = client
+                
+                logger.info(f"Connected to MongoDB: {self.config.host}:{self.config.port}/{self.config.database}")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Failed to connect to MongoDB: {e}")
+                return False
+    
+    def _pool_sizes(self) -> Tuple[int, int]:
+        """Get (max, min) pool size, sized from worker concurrency unless configured"""
+        concurrency = get_config().worker.max_concurrent_tasks
+        max_pool_size = self.config.max_pool_size or max(concurrency * 2, 10)
+        min_pool_size = self.config.min_pool_size
+        if min_pool_size is None:
+            min_pool_size = min(concurrency, max_pool_size)
+        return max_pool_size, min_pool_size
     
     def disconnect(self):
         """Close MongoDB connection"""
-        if self._client is not None:
-            self._client.close()
-            self._client = None
-            self._database = None
-            logger.info("Disconnected from MongoDB")
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+                self._database = None
+                logger.info("Disconnected from MongoDB")
     
     @property
     def client(self) -> MongoClient:
@@ -64,55 +146,88 @@ class MongoDBConnection:
                 raise ConnectionError("Failed to connect to MongoDB")
         return self._database
     
-    def get_collection(self, collection_name: str) -> Collection:
-        """Get collection instance"""
-        # logger.info(f"self.database: {self.database}")
-        return self.database[collection_name]
+    def get_collection(self, collection_name: str, write_concern: Optional[WriteConcern] = None) -> Collection:
+        """Get collection instance, optionally with a call-site write concern"""
+        collection = self.database[collection_name]
+        if write_concern is not None:
+            collection = collection.with_options(write_concern=write_concern)
+        return collection
     
     def create_indexes(self):
         """Create database indexes for performance"""
         try:
             db = self.database
             
-            # Task metadata indexes
-            tasks = db.task_metadata
-            tasks.create_index([("task_id", 1)], unique=True)
-            tasks.create_index([("is_active", 1)])
-            tasks.create_index([("category", 1)])
-            tasks.create_index([("tags", 1)])
-            tasks.create_index([("created_at", -1)])
+            retention_days = self.config.execution_retention_days
             
-            # Pipeline metadata indexes
-            pipelines = db.pipeline_metadata
-            pipelines.create_index([("pipeline_id", 1)], unique=True)
-            pipelines.create_index([("is_active", 1)])
-            pipelines.create_index([("category", 1)])
-            pipelines.create_index([("tags", 1)])
-            pipelines.create_index([("created_at", -1)])
+            # Skip entirely when this exact index set was already applied
+            spec_hash = hashlib.sha256(repr((INDEX_SPECS, retention_days)).encode()).hexdigest()
+            meta = db[META_COLLECTION]
+            if meta.find_one({"_id": "indexes", "hash": spec_hash}, {"_id": 1}):
+                logger.info("Database indexes up to date")
+                return
             
-            # Execution records indexes
-            executions = db.execution_records
-            executions.create_index([("execution_id", 1)], unique=True)
-            executions.create_index([("celery_task_id", 1)], unique=True)
-            executions.create_index([("task_id", 1)])
-            executions.create_index([("pipeline_id", 1)])
-            executions.create_index([("worker_id", 1)])
-            executions.create_index([("status", 1)])
-            executions.create_index([("created_at", -1)])
-            executions.create_index([("started_at", -1)])
-            executions.create_index([("completed_at", -1)])
+            # One createIndexes command per collection
+            for collection_name, specs in INDEX_SPECS.items():
+                db[collection_name].create_indexes([
+                    IndexModel(keys, unique=unique) for keys, unique in specs
+                ])
             
-            # Worker status indexes
-            workers = db.worker_status
-            workers.create_index([("worker_id", 1)], unique=True)
-            workers.create_index([("is_active", 1)])
-            workers.create_index([("last_heartbeat", -1)])
+            if not self.set_execution_retention(retention_days):
+                return
             
+            for collection_name, index_names in RETIRED_INDEXES.items():
+                existing = db[collection_name].index_information()
+                for index_name in index_names:
+                    if index_name in existing:
+                        db[collection_name].drop_index(index_name)
+                        logger.info(f"Dropped retired index {collection_name}.{index_name}")
+            
+            meta.replace_one({"_id": "indexes"}, {"_id": "indexes", "hash": spec_hash}, upsert=True)
             logger.info("Database indexes created successfully")
             
         except Exception as e:
             logger.error(f"Failed to create database indexes: {e}")
     
+    def set_execution_retention(self, days: Optional[int]) -> bool:
+        """
+        Set how long execution records are kept
+        
+        The TTL index on created_at is created, retuned in place with
+        collMod, or made a plain index when days is None. MongoDB's TTL
+        monitor then deletes expired records in the background.
+        
+        Args:
+            days: Retention in days, or None to keep records indefinitely
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            collection = self.database["execution_records"]
+            existing = collection.index_information().get(EXECUTION_TTL_INDEX)
+            seconds = days * 86400 if days is not None else None
+            
+            if existing is not None:
+                if existing.get("expireAfterSeconds") == seconds:
+                    return True
+                if seconds is not None and "expireAfterSeconds" in existing:
+                    self.database.command("collMod", "execution_records", index={
+                        "name": EXECUTION_TTL_INDEX, "expireAfterSeconds": seconds
+                    })
+                    logger.info(f"Execution record retention set to {days} days")
+                    return True
+                collection.drop_index(EXECUTION_TTL_INDEX)
+            
+            options = {"expireAfterSeconds": seconds} if seconds is not None else {}
+            collection.create_index([("created_at", 1)], name=EXECUTION_TTL_INDEX, **options)
+            logger.info(f"Execution record retention set to {days if days is not None else 'unlimited'} days")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to set execution record retention: {e}")
+            return False
+    
     def health_check(self) -> bool:
         """Check MongoDB connection health"""
         try:
@@ -124,13 +239,16 @@ class MongoDBConnection:
 
 # Global connection instance
 _mongodb_connection: Optional[MongoDBConnection] = None
+_mongodb_connection_lock = threading.Lock()
 
 
 def get_mongodb_connection() -> MongoDBConnection:
     """Get global MongoDB connection"""
     global _mongodb_connection
     if not _mongodb_connection:
-        _mongodb_connection = MongoDBConnection()
+        with _mongodb_connection_lock:
+            if not _mongodb_connection:
+                _mongodb_connection = MongoDBConnection()
     return _mongodb_connection
 
 
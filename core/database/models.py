@@ -1,12 +1,41 @@
 """
 Database models for MongoDB collections
 """
+import os
+import random
+import threading
+import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from pydantic import BaseModel, Field
+import bson
+from bson.errors import InvalidDocument
+from pydantic import BaseModel, Field, field_validator
 from enum import Enum
 
 
+# Per-thread PRNG for execution IDs; seeded once instead of reading
+# /dev/urandom for every ID like uuid.uuid4() does
+_id_state = threading.local()
+
+
+def _reset_id_state():
+    """Drop inherited PRNG state so forked children don't repeat IDs"""
+    global _id_state
+    _id_state = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_state)
+
+
+def new_execution_id() -> str:
+    """Generate a random UUID4 string for execution records"""
+    rng = getattr(_id_state, "rng", None)
+    if rng is None:
+        rng = _id_state.rng = random.Random(os.urandom(16))
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
 class TaskStatus(str, Enum):
     """Task execution status"""
     PENDING = "pending"
@@ -92,6 +121,35 @@ class PipelineMetadata(BaseModel):
     category: str = Field(default="general", description="Pipeline category")
 
 
+# Largest output_data kept inline in an execution record, in BSON bytes;
+# anything bigger is written to object storage and referenced by {"_ref": ...}
+MAX_INLINE_OUTPUT = 256 * 1024
+
+_SMALL_OUTPUT_FIELDS = 32
+_SMALL_OUTPUT_STRING = 1024
+_SMALL_OUTPUT_SCALARS = (bool, int, float, datetime, type(None))
+
+
+def is_small_output(output_data: Any) -> bool:
+    """
+    Cheap check for outputs that cannot reach MAX_INLINE_OUTPUT
+    
+    True for a dict of a few scalars and short strings, the common shape
+    of task results, so those are never encoded just to be measured.
+    """
+    if not isinstance(output_data, dict) or len(output_data) > _SMALL_OUTPUT_FIELDS:
+        return False
+    for key, value in output_data.items():
+        if not isinstance(key, str) or len(key) > _SMALL_OUTPUT_STRING:
+            return False
+        if isinstance(value, str):
+            if len(value) > _SMALL_OUTPUT_STRING:
+                return False
+        elif not isinstance(value, _SMALL_OUTPUT_SCALARS):
+            return False
+    return True
+
+
 class ExecutionRecord(BaseModel):
     """Task/Pipeline execution record"""
     execution_id: str = Field(..., description="Unique execution ID")
@@ -130,6 +188,20 @@ class ExecutionRecord(BaseModel):
     
     # Metadata
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    
+    @field_validator("output_data")
+    @classmethod
+    def _check_output_size(cls, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Reject outputs too large to embed; they belong in object storage"""
+        if value is None or is_small_output(value):
+            return value
+        try:
+            size = len(bson.encode(value))
+        except InvalidDocument:
+            return value  # Not storable as BSON at all; the write reports that
+        if size > MAX_INLINE_OUTPUT:
+            raise ValueError(f"output_data is {size} bytes, over the {MAX_INLINE_OUTPUT} byte inline limit")
+        return value
 
 
 class WorkerStatus(BaseModel):
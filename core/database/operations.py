@@ -1,57 +1,215 @@
 """
 Database operations for task and pipeline management
 """
+import atexit
+import json
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from pymongo import ReturnDocument
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+import bson
+from bson.errors import InvalidDocument
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import BulkWriteError
 from loguru import logger
 
 from .connection import get_mongodb_connection
 from .models import (
     TaskMetadata, PipelineMetadata, ExecutionRecord, 
-    WorkerStatus, TaskStatus, TaskType
+    WorkerStatus, TaskStatus, TaskType, MAX_INLINE_OUTPUT, is_small_output
 )
 
 
 class DatabaseOperations:
     """Database operations manager"""
     
+    # Execution record write-behind settings
+    execution_batch_size = 500
+    execution_buffer_limit = 10000
+    execution_flush_interval = 0.05  # seconds
+    # Failed writes are retried after this delay, and given up after this many attempts
+    execution_retry_delay = 1.0  # seconds
+    execution_write_attempts = 5
+    
+    # Statistics cache TTLs
+    worker_stats_ttl = 5.0  # seconds
+    task_stats_ttl = 30.0  # seconds
+    
+    # Task and pipeline metadata read caches; changes made by other processes show up after this
+    task_metadata_ttl = 30.0  # seconds
+    pipeline_metadata_ttl = 30.0  # seconds
+    
+    # Execution statistics stages shared by task statistics queries; the server
+    # returns at most one document already in the shape callers expect
+    _TASK_STATS_STAGES = [
+        {"$group": {
+            "_id": None,
+            "total_executions": {"$sum": 1},
+            **{
+                key: {"$sum": {"$cond": [{"$eq": ["$status", status.value]}, 1, 0]}}
+                for key, status in (
+                    ("successful", TaskStatus.SUCCESS),
+                    ("failed", TaskStatus.FAILED),
+                    ("pending", TaskStatus.PENDING),
+                    ("running", TaskStatus.RUNNING),
+                )
+            },
+            "avg_duration": {"$avg": {
+                "$cond": [{"$eq": ["$status", TaskStatus.SUCCESS.value]}, "$duration", None]
+            }},
+            "total_duration": {"$sum": {
+                "$cond": [{"$eq": ["$status", TaskStatus.SUCCESS.value]}, "$duration", 0]
+            }},
+        }},
+        {"$project": {"_id": 0, "avg_duration": {"$ifNull": ["$avg_duration", 0]},
+                      "total_executions": 1, "successful": 1, "failed": 1,
+                      "pending": 1, "running": 1, "total_duration": 1}},
+    ]
+    _EMPTY_TASK_STATS = {
+        "total_executions": 0,
+        "successful": 0,
+        "failed": 0,
+        "pending": 0,
+        "running": 0,
+        "avg_duration": 0,
+        "total_duration": 0
+    }
+    
+    # Write concerns by call site: registrations must survive a failover,
+    # heartbeats are superseded by the next one and need no acknowledgement
+    REGISTRATION_WRITE = WriteConcern(w="majority")
+    HEARTBEAT_WRITE = WriteConcern(w=0)
+    
+    # Cursor batch size for list queries
+    list_batch_size = 200
+    
+    # Execution outputs larger than this (BSON bytes) are written to object
+    # storage and replaced in the record by {"_ref": object_name, "size": n}
+    max_inline_output = MAX_INLINE_OUTPUT
+    
+    # Worker status fields sent on every write, even when unchanged since the last one
+    _WORKER_ALWAYS_SET = frozenset({"is_active"})
+    
+    # Fetch only the fields the models read, never Mongo's _id
+    _TASK_PROJECTION = {**{field: 1 for field in TaskMetadata.model_fields}, "_id": 0}
+    _PIPELINE_PROJECTION = {**{field: 1 for field in PipelineMetadata.model_fields}, "_id": 0}
+    _EXECUTION_PROJECTION = {**{field: 1 for field in ExecutionRecord.model_fields}, "_id": 0}
+    _WORKER_PROJECTION = {**{field: 1 for field in WorkerStatus.model_fields}, "_id": 0}
+    # WorkerStatus holds only plain scalars, lists and dicts, so worker documents are
+    # hydrated with model_construct; the other models have enum fields that need coercion
+    
+    # Execution records are dumped on every insert; calling the compiled
+    # serializer directly skips model_dump's per-call argument handling
+    _EXECUTION_SERIALIZER = ExecutionRecord.__pydantic_serializer__
+    
     def __init__(self):
         self.conn = get_mongodb_connection()
+        self._execution_buffer: deque = deque()
+        # Records queued or being inserted, by execution ID, so reads can be
+        # answered without forcing a flush
+        self._queued_records: Dict[str, ExecutionRecord] = {}
+        # Queued $set fields per execution ID, merged until the next flush
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        # Updates taken by the flush in progress, visible to reads until written
+        self._inflight_updates: Dict[str, Dict[str, Any]] = {}
+        self._updates_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._flusher_thread: Optional[threading.Thread] = None
+        # Failed write attempts per execution ID, and whether the last flush left writes to retry
+        self._insert_attempts: Dict[str, int] = {}
+        self._update_attempts: Dict[str, int] = {}
+        self._retry_pending = False
+        self._worker_stats_cache: Dict[str, Tuple[float, Dict[str, int]]] = {}
+        self._task_stats_cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        self._task_metadata_cache: Dict[str, Tuple[float, TaskMetadata]] = {}
+        self._pipeline_metadata_cache: Dict[str, Tuple[float, PipelineMetadata]] = {}
+        # Worker status fields as last written, per worker ID, so writes send only changes
+        self._last_sent_status: Dict[str, Dict[str, Any]] = {}
     
     # Task Metadata Operations
     
     def create_task_metadata(self, task_metadata: TaskMetadata) -> bool:
         """Create new task metadata"""
         try:
-            collection = self.conn.get_collection("task_metadata")
+            collection = self.conn.get_collection("task_metadata", self.REGISTRATION_WRITE)
             result = collection.insert_one(task_metadata.model_dump())
+            self.invalidate_task_cache(task_metadata.task_id)
             logger.info(f"Task metadata created: {task_metadata.task_id}")
-            return bool(result.inserted_id)
+            return result.acknowledged
         except Exception as e:
             # raise
             logger.error(f"Failed to create task metadata {task_metadata.task_id}: {e}")
             return False
     
+    def create_task_metadata_bulk(self, task_metadata_list: List[TaskMetadata]) -> List[str]:
+        """Insert many task metadata documents in one round trip, returns inserted task IDs"""
+        if not task_metadata_list:
+            return []
+        for task_metadata in task_metadata_list:
+            self.invalidate_task_cache(task_metadata.task_id)
+        try:
+            collection = self.conn.get_collection("task_metadata", self.REGISTRATION_WRITE)
+            collection.insert_many(
+                [task_metadata.model_dump() for task_metadata in task_metadata_list],
+                ordered=False
+            )
+            return [task_metadata.task_id for task_metadata in task_metadata_list]
+        except BulkWriteError as e:
+            # Unordered insert: everything except the failed indexes was written
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            logger.error(f"Failed to create {len(failed)} task metadata documents: {e}")
+            return [
+                task_metadata.task_id
+                for index, task_metadata in enumerate(task_metadata_list)
+                if index not in failed
+            ]
+        except Exception as e:
+            logger.error(f"Failed to create {len(task_metadata_list)} task metadata documents: {e}")
+            return []
+    
     def get_task_metadata(self, task_id: str) -> Optional[TaskMetadata]:
-        """Get task metadata by ID"""
+        """Get task metadata by ID, cached for `task_metadata_ttl` seconds"""
+        now = time.monotonic()
+        cached = self._task_metadata_cache.get(task_id)
+        if cached and cached[0] > now:
+            # A copy, so callers mutating the result never change the cache
+            return cached[1].model_copy(deep=True)
+        
         try:
             collection = self.conn.get_collection("task_metadata")
-            doc = collection.find_one({"task_id": task_id})
-            return TaskMetadata(**doc) if doc is not None else None
+            doc = collection.find_one({"task_id": task_id}, self._TASK_PROJECTION)
+            if doc is None:
+                return None
+            
+            task_metadata = TaskMetadata.model_validate(doc)
+            self._task_metadata_cache[task_id] = (now + self.task_metadata_ttl, task_metadata)
+            return task_metadata.model_copy(deep=True)
         except Exception as e:
             logger.error(f"Failed to get task metadata {task_id}: {e}")
             return None
     
+    def invalidate_task_cache(self, task_id: Optional[str] = None):
+        """Drop cached task metadata for one task, or all tasks if no ID is given"""
+        if task_id is None:
+            self._task_metadata_cache.clear()
+        else:
+            self._task_metadata_cache.pop(task_id, None)
+    
     def update_task_metadata(self, task_id: str, updates: Dict[str, Any]) -> bool:
         """Update task metadata"""
+        self.invalidate_task_cache(task_id)
         try:
-            updates["updated_at"] = datetime.utcnow()
+            # Timestamped by the server, so workers' clocks don't matter
+            update = {"$currentDate": {"updated_at": True}}
+            fields = {key: value for key, value in updates.items() if key != "updated_at"}
+            if fields:
+                update["$set"] = fields
+            
             collection = self.conn.get_collection("task_metadata")
-            result = collection.update_one(
-                {"task_id": task_id},
-                {"$set": updates}
-            )
+            result = collection.update_one({"task_id": task_id}, update)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to update task metadata {task_id}: {e}")
@@ -60,21 +218,31 @@ class DatabaseOperations:
     def list_tasks(self, active_only: bool = True, category: Optional[str] = None) -> List[TaskMetadata]:
         """List all tasks"""
         try:
-            collection = self.conn.get_collection("task_metadata")
-            query = {}
-            if active_only:
-                query["is_active"] = True
-            if category:
-                query["category"] = category
-            
-            docs = collection.find(query).sort("created_at", -1)
-            return [TaskMetadata(**doc) for doc in docs]
+            return list(self.iter_tasks(active_only, category))
         except Exception as e:
             logger.error(f"Failed to list tasks: {e}")
             return []
     
+    def iter_tasks(self, active_only: bool = True, category: Optional[str] = None) -> Iterator[TaskMetadata]:
+        """Stream tasks one cursor batch at a time; database errors propagate to the caller"""
+        collection = self.conn.get_collection("task_metadata")
+        query = {}
+        if active_only:
+            query["is_active"] = True
+        if category:
+            query["category"] = category
+        
+        docs = (
+            collection.find(query, self._TASK_PROJECTION)
+            .sort("created_at", -1)
+            .batch_size(self.list_batch_size)
+        )
+        for doc in docs:
+            yield TaskMetadata.model_validate(doc)
+    
     def delete_task_metadata(self, task_id: str) -> bool:
         """Delete task metadata"""
+        self.invalidate_task_cache(task_id)
         try:
             collection = self.conn.get_collection("task_metadata")
             result = collection.delete_one({"task_id": task_id})
@@ -88,33 +256,54 @@ class DatabaseOperations:
     def create_pipeline_metadata(self, pipeline_metadata: PipelineMetadata) -> bool:
         """Create new pipeline metadata"""
         try:
-            collection = self.conn.get_collection("pipeline_metadata")
+            collection = self.conn.get_collection("pipeline_metadata", self.REGISTRATION_WRITE)
             result = collection.insert_one(pipeline_metadata.model_dump())
+            self.invalidate_pipeline_cache(pipeline_metadata.pipeline_id)
             logger.info(f"Pipeline metadata created: {pipeline_metadata.pipeline_id}")
-            return bool(result.inserted_id)
+            return result.acknowledged
         except Exception as e:
             logger.error(f"Failed to create pipeline metadata {pipeline_metadata.pipeline_id}: {e}")
             return False
     
     def get_pipeline_metadata(self, pipeline_id: str) -> Optional[PipelineMetadata]:
-        """Get pipeline metadata by ID"""
+        """Get pipeline metadata by ID, cached for `pipeline_metadata_ttl` seconds"""
+        now = time.monotonic()
+        cached = self._pipeline_metadata_cache.get(pipeline_id)
+        if cached and cached[0] > now:
+            return cached[1].model_copy(deep=True)
+        
         try:
             collection = self.conn.get_collection("pipeline_metadata")
-            doc = collection.find_one({"pipeline_id": pipeline_id})
-            return PipelineMetadata(**doc) if doc is not None else None
+            doc = collection.find_one({"pipeline_id": pipeline_id}, self._PIPELINE_PROJECTION)
+            if doc is None:
+                return None
+            
+            pipeline_metadata = PipelineMetadata.model_validate(doc)
+            self._pipeline_metadata_cache[pipeline_id] = (now + self.pipeline_metadata_ttl, pipeline_metadata)
+            return pipeline_metadata.model_copy(deep=True)
         except Exception as e:
             logger.error(f"Failed to get pipeline metadata {pipeline_id}: {e}")
             return None
     
+    def invalidate_pipeline_cache(self, pipeline_id: Optional[str] = None):
+        """Drop cached pipeline metadata for one pipeline, or all pipelines if no ID is given"""
+        if pipeline_id is None:
+            self._pipeline_metadata_cache.clear()
+        else:
+            self._pipeline_metadata_cache.pop(pipeline_id, None)
+    
     def update_pipeline_metadata(self, pipeline_id: str, updates: Dict[str, Any]) -> bool:
         """Update pipeline metadata"""
+        self.invalidate_pipeline_cache(pipeline_id)
         try:
-            updates["updated_at"] = datetime.utcnow()
+            # Timestamped by the server, so workers' clocks don't matter
+            update = {"$currentDate": {"updated_at": True}}
+            fields = {key: value for key, value in updates.items() if key != "updated_at"}
+            if fields:
+                update["$set"] = fields
+            
             collection = self.conn.get_collection("pipeline_metadata")
-            result = collection.update_one(
-                {"pipeline_id": pipeline_id},
-                {"$set": updates}
-            )
+            result = collection.update_one({"pipeline_id": pipeline_id}, update)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to update pipeline metadata {pipeline_id}: {e}")
@@ -123,21 +312,31 @@ class DatabaseOperations:
     def list_pipelines(self, active_only: bool = True, category: Optional[str] = None) -> List[PipelineMetadata]:
         """List all pipelines"""
         try:
-            collection = self.conn.get_collection("pipeline_metadata")
-            query = {}
-            if active_only:
-                query["is_active"] = True
-            if category:
-                query["category"] = category
-            
-            docs = collection.find(query).sort("created_at", -1)
-            return [PipelineMetadata(**doc) for doc in docs]
+            return list(self.iter_pipelines(active_only, category))
         except Exception as e:
             logger.error(f"Failed to list pipelines: {e}")
             return []
     
+    def iter_pipelines(self, active_only: bool = True, category: Optional[str] = None) -> Iterator[PipelineMetadata]:
+        """Stream pipelines one cursor batch at a time; database errors propagate to the caller"""
+        collection = self.conn.get_collection("pipeline_metadata")
+        query = {}
+        if active_only:
+            query["is_active"] = True
+        if category:
+            query["category"] = category
+        
+        docs = (
+            collection.find(query, self._PIPELINE_PROJECTION)
+            .sort("created_at", -1)
+            .batch_size(self.list_batch_size)
+        )
+        for doc in docs:
+            yield PipelineMetadata.model_validate(doc)
+    
     def delete_pipeline_metadata(self, pipeline_id: str) -> bool:
         """Delete pipeline metadata"""
+        self.invalidate_pipeline_cache(pipeline_id)
         try:
             collection = self.conn.get_collection("pipeline_metadata")
             result = collection.delete_one({"pipeline_id": pipeline_id})
@@ -152,15 +351,235 @@ class DatabaseOperations:
         """Create new execution record"""
         try:
             collection = self.conn.get_collection("execution_records")
-            result = collection.insert_one(execution_record.model_dump())
-            return bool(result.inserted_id)
+            result = collection.insert_one(self._EXECUTION_SERIALIZER.to_python(execution_record))
+            return result.acknowledged
         except Exception as e:
             logger.error(f"Failed to create execution record {execution_record.execution_id}: {e}")
             return False
     
+    def create_execution_records_bulk(self, execution_records: List[ExecutionRecord]) -> int:
+        """Insert many execution records in one round trip, returns inserted count"""
+        if not execution_records:
+            return 0
+        return len(execution_records) - len(self._insert_execution_batch(execution_records))
+    
+    def _insert_execution_batch(self, execution_records: List[ExecutionRecord]) -> List[ExecutionRecord]:
+        """Insert execution records as one unordered insert_many, returns the records that failed"""
+        try:
+            collection = self.conn.get_collection("execution_records")
+            collection.insert_many(
+                [self._EXECUTION_SERIALIZER.to_python(record) for record in execution_records],
+                ordered=False
+            )
+            return []
+        except BulkWriteError as e:
+            # A duplicate key means an earlier attempt already inserted the record
+            failed = [
+                execution_records[error["index"]]
+                for error in e.details.get("writeErrors", [])
+                if error.get("code") != 11000
+            ]
+            if failed:
+                logger.error(f"Failed to insert {len(failed)} execution records: {e}")
+            return failed
+        except Exception as e:
+            logger.error(f"Failed to insert {len(execution_records)} execution records: {e}")
+            return list(execution_records)
+    
+    def queue_execution_record(self, execution_record: ExecutionRecord) -> bool:
+        """
+        Queue execution record for batched insert
+        
+        Records are written by a background flusher thread. Until then
+        get_execution_record answers from the buffer.
+        """
+        if len(self._execution_buffer) >= self.execution_buffer_limit:
+            # Buffer full, apply backpressure by flushing on the caller thread
+            self.flush_execution_records()
+        
+        with self._updates_lock:
+            self._queued_records[execution_record.execution_id] = execution_record
+        self._execution_buffer.append(execution_record)
+        self._ensure_flusher()
+        self._flush_event.set()
+        return True
+    
+    def queue_execution_update(self, execution_id: str, updates: Dict[str, Any]) -> bool:
+        """
+        Queue execution record updates for a batched write
+        
+        Updates queued for the same execution before the next flush are
+        merged, later fields winning, and sent as one operation. They are
+        applied after any queued inserts.
+        """
+        if updates.get("output_data"):
+            updates = {**updates, "output_data": self._spill_output(execution_id, updates["output_data"])}
+        
+        with self._updates_lock:
+            self._pending_updates.setdefault(execution_id, {}).update(updates)
+        self._ensure_flusher()
+        self._flush_event.set()
+        return True
+    
+    def flush_execution_records(self) -> int:
+        """
+        Write all queued execution records and updates, returns inserted count
+        
+        Records whose insert fails go back to the front of the buffer and
+        stay readable; they are retried by later flushes and dropped, with
+        an error, after `execution_write_attempts` failures.
+        """
+        inserted = 0
+        with self._flush_lock:
+            self._retry_pending = False
+            while self._execution_buffer:
+                batch = []
+                while self._execution_buffer and len(batch) < self.execution_batch_size:
+                    batch.append(self._execution_buffer.popleft())
+                failed = self._insert_execution_batch(batch)
+                inserted += len(batch) - len(failed)
+                
+                failed_ids = {record.execution_id for record in failed}
+                retry = []
+                for record in failed:
+                    attempts = self._insert_attempts.get(record.execution_id, 0) + 1
+                    if attempts < self.execution_write_attempts:
+                        self._insert_attempts[record.execution_id] = attempts
+                        retry.append(record)
+                    else:
+                        logger.error(f"Dropped execution record {record.execution_id} after {attempts} failed inserts")
+                        failed_ids.discard(record.execution_id)
+                        self._insert_attempts.pop(record.execution_id, None)
+                self._execution_buffer.extendleft(reversed(retry))
+                
+                with self._updates_lock:
+                    for record in batch:
+                        if record.execution_id not in failed_ids:
+                            self._queued_records.pop(record.execution_id, None)
+                            self._insert_attempts.pop(record.execution_id, None)
+                if retry:
+                    # The database is refusing writes; leave the rest for the retry
+                    self._retry_pending = True
+                    break
+            
+            with self._updates_lock:
+                # Updates to records still waiting for their insert stay queued,
+                # an update sent first would match nothing and be lost
+                pending = {
+                    execution_id: updates for execution_id, updates in self._pending_updates.items()
+                    if execution_id not in self._queued_records
+                }
+                for execution_id in pending:
+                    del self._pending_updates[execution_id]
+                self._inflight_updates = pending
+            failed = {}
+            if pending:
+                try:
+                    failed = self._apply_execution_updates(pending)
+                finally:
+                    with self._updates_lock:
+                        for execution_id, updates in self._retry_updates(failed).items():
+                            # Fields queued since the flush started are newer and win
+                            self._pending_updates[execution_id] = {
+                                **updates, **self._pending_updates.get(execution_id, {})
+                            }
+                        self._inflight_updates = {}
+            for execution_id in pending:
+                if execution_id not in failed:
+                    self._update_attempts.pop(execution_id, None)
+        return inserted
+    
+    def _retry_updates(self, failed: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Failed updates still within `execution_write_attempts`, to be queued again"""
+        retry = {}
+        for execution_id, updates in failed.items():
+            attempts = self._update_attempts.get(execution_id, 0) + 1
+            if attempts < self.execution_write_attempts:
+                self._update_attempts[execution_id] = attempts
+                retry[execution_id] = updates
+            else:
+                logger.error(f"Dropped update to execution record {execution_id} after {attempts} failed attempts")
+                self._update_attempts.pop(execution_id, None)
+        if retry:
+            self._retry_pending = True
+        return retry
+    
+    def _pending_execution(self, execution_id: str) -> Tuple[Optional[ExecutionRecord], Dict[str, Any]]:
+        """Get the queued insert and merged queued updates for an execution not yet written"""
+        with self._updates_lock:
+            record = self._queued_records.get(execution_id)
+            updates = {
+                **self._inflight_updates.get(execution_id, {}),
+                **self._pending_updates.get(execution_id, {})
+            }
+        return record, updates
+    
+    def _apply_execution_updates(self, pending: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Send merged execution record updates as unordered bulk writes, returns the ones that failed"""
+        execution_ids = list(pending)
+        failed = {}
+        for start in range(0, len(execution_ids), self.execution_batch_size):
+            chunk = execution_ids[start:start + self.execution_batch_size]
+            try:
+                collection = self.conn.get_collection("execution_records")
+                collection.bulk_write([
+                    UpdateOne({"execution_id": execution_id}, {"$set": pending[execution_id]})
+                    for execution_id in chunk
+                ], ordered=False)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                logger.error(f"Failed to apply {len(errors)} execution record updates: {e}")
+                for error in errors:
+                    failed[chunk[error["index"]]] = pending[chunk[error["index"]]]
+            except Exception as e:
+                logger.error(f"Failed to apply {len(chunk)} execution record updates: {e}")
+                failed.update((execution_id, pending[execution_id]) for execution_id in chunk)
+        return failed
+    
+    def _ensure_flusher(self):
+        """Start the execution record flusher thread if not running"""
+        if self._flusher_thread is not None and self._flusher_thread.is_alive():
+            return
+        with self._flush_lock:
+            if self._flusher_thread is not None and self._flusher_thread.is_alive():
+                return
+            if self._flusher_thread is None:
+                atexit.register(self.flush_execution_records)
+            self._flusher_thread = threading.Thread(
+                target=self._flush_loop,
+                name="execution-record-flusher",
+                daemon=True
+            )
+            self._flusher_thread.start()
+    
+    def _flush_loop(self):
+        """Background loop draining the execution record buffer"""
+        while True:
+            self._flush_event.wait()
+            # Let a batch accumulate before writing, unless one is already full
+            if len(self._execution_buffer) < self.execution_batch_size:
+                time.sleep(self.execution_flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush_execution_records()
+            except Exception as e:
+                logger.error(f"Execution record flush failed: {e}")
+            if self._retry_pending:
+                # Back off before retrying failed writes
+                time.sleep(self.execution_retry_delay)
+                self._flush_event.set()
+    
     def update_execution_record(self, execution_id: str, updates: Dict[str, Any]) -> bool:
         """Update execution record"""
+        record, pending = self._pending_execution(execution_id)
+        if record is not None or pending:
+            # Not inserted yet, or queued updates would land after a direct
+            # write; queue behind them to keep the order
+            return self.queue_execution_update(execution_id, updates)
         try:
+            if updates.get("output_data"):
+                updates = {**updates, "output_data": self._spill_output(execution_id, updates["output_data"])}
+            
             collection = self.conn.get_collection("execution_records")
             result = collection.update_one(
                 {"execution_id": execution_id},
@@ -171,15 +590,63 @@ class DatabaseOperations:
             logger.error(f"Failed to update execution record {execution_id}: {e}")
             return False
     
-    def get_execution_record(self, execution_id: str) -> Optional[ExecutionRecord]:
-        """Get execution record by ID"""
+    def _spill_output(self, execution_id: str, output_data: Any) -> Any:
+        """Move an oversized output to object storage, returning what to store inline"""
+        if is_small_output(output_data):
+            return output_data
         try:
-            collection = self.conn.get_collection("execution_records")
-            doc = collection.find_one({"execution_id": execution_id})
-            return ExecutionRecord(**doc) if doc is not None else None
-        except Exception as e:
-            logger.error(f"Failed to get execution record {execution_id}: {e}")
+            data = bson.encode({"v": output_data})
+        except InvalidDocument:
+            return output_data  # Not storable as BSON; let the write report it
+        if len(data) <= self.max_inline_output:
+            return output_data
+        
+        from ..storage.operations import storage_ops
+        
+        # Stored as the BSON already encoded for measuring, so every value
+        # the record could have held round-trips unchanged
+        object_name = f"executions/{execution_id}/output.bson"
+        if not storage_ops.upload_bytes(object_name, data, content_type="application/bson"):
+            logger.error(f"Dropped {len(data)} byte output of execution {execution_id}: upload failed")
+            return {"_ref": None, "size": len(data)}
+        return {"_ref": object_name, "size": len(data)}
+    
+    def get_execution_output(self, execution_id: str) -> Optional[Any]:
+        """Get an execution's output, fetching it from object storage if it was spilled"""
+        record = self.get_execution_record(execution_id)
+        if not record or not record.output_data:
+            return None
+        
+        if "_ref" not in record.output_data:
+            return record.output_data
+        object_name = record.output_data["_ref"]
+        if not object_name:
+            return None
+        
+        from ..storage.operations import storage_ops
+        
+        data = storage_ops.download_bytes(object_name)
+        if data is None:
             return None
+        if object_name.endswith(".json"):
+            return json.loads(data)  # Spilled before outputs were stored as BSON
+        return bson.decode(data)["v"]
+    
+    def get_execution_record(self, execution_id: str) -> Optional[ExecutionRecord]:
+        """Get execution record by ID, including queued inserts and updates not yet written"""
+        record, updates = self._pending_execution(execution_id)
+        if record is None:
+            try:
+                collection = self.conn.get_collection("execution_records")
+                doc = collection.find_one({"execution_id": execution_id})
+                if doc is None:
+                    return None
+                record = ExecutionRecord.model_validate(doc)
+            except Exception as e:
+                logger.error(f"Failed to get execution record {execution_id}: {e}")
+                return None
+        # A copy, so callers never modify the queued record
+        return record.model_copy(update=updates)
     
     def list_execution_records(
         self, 
@@ -191,45 +658,164 @@ class DatabaseOperations:
     ) -> List[ExecutionRecord]:
         """List execution records with filters"""
         try:
-            collection = self.conn.get_collection("execution_records")
-            query = {}
-            if task_id:
-                query["task_id"] = task_id
-            if pipeline_id:
-                query["pipeline_id"] = pipeline_id
-            if worker_id:
-                query["worker_id"] = worker_id
-            if status:
-                query["status"] = status
-            
-            docs = collection.find(query).sort("created_at", -1).limit(limit)
-            return [ExecutionRecord(**doc) for doc in docs]
+            return list(self.iter_execution_records(task_id, pipeline_id, worker_id, status, limit))
         except Exception as e:
             logger.error(f"Failed to list execution records: {e}")
             return []
     
+    def iter_execution_records(
+        self, 
+        task_id: Optional[str] = None,
+        pipeline_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[ExecutionRecord]:
+        """
+        Stream execution records with filters, newest first
+        
+        Only one cursor batch is held in memory at a time, so this suits
+        exports over the whole collection. Records and updates queued in
+        the last `execution_flush_interval` may not be visible yet; call
+        flush_execution_records() first when that matters. Database
+        errors propagate to the caller.
+        """
+        collection = self.conn.get_collection("execution_records")
+        query = {}
+        if task_id:
+            query["task_id"] = task_id
+        if pipeline_id:
+            query["pipeline_id"] = pipeline_id
+        if worker_id:
+            query["worker_id"] = worker_id
+        if status:
+            query["status"] = status
+        
+        docs = collection.find(query, self._EXECUTION_PROJECTION).sort("created_at", -1)
+        if limit:
+            docs = docs.limit(limit).batch_size(min(limit, self.list_batch_size))
+        else:
+            docs = docs.batch_size(self.list_batch_size)
+        for doc in docs:
+            yield ExecutionRecord.model_validate(doc)
+    
     # Worker Status Operations
     
-    def update_worker_status(self, worker_status: WorkerStatus) -> bool:
-        """Update or create worker status"""
+    def update_worker_status(self, worker_status: WorkerStatus, acknowledged: bool = True) -> bool:
+        """
+        Update or create worker status
+        
+        With acknowledged=False the write is sent without waiting for the
+        server; only network errors are reported.
+        """
         try:
-            collection = self.conn.get_collection("worker_status")
+            collection = self.conn.get_collection(
+                "worker_status", None if acknowledged else self.HEARTBEAT_WRITE
+            )
+            update, fields = self._worker_status_update(worker_status)
             result = collection.update_one(
-                {"worker_id": worker_status.worker_id},
-                {"$set": worker_status.model_dump()},
-                upsert=True
+                {"worker_id": worker_status.worker_id}, update, upsert=True
             )
-            return result.acknowledged
+            if not acknowledged:
+                # A w=0 write may be lost, so it must not become the diff baseline
+                return True
+            if result.acknowledged:
+                self._remember_worker_status(worker_status.worker_id, fields)
+                return True
+            return False
         except Exception as e:
             logger.error(f"Failed to update worker status {worker_status.worker_id}: {e}")
             return False
     
+    def update_and_get_worker_status(self, worker_status: WorkerStatus) -> Optional[WorkerStatus]:
+        """Update or create worker status and return the stored document in the same round trip"""
+        try:
+            collection = self.conn.get_collection("worker_status")
+            update, fields = self._worker_status_update(worker_status)
+            doc = collection.find_one_and_update(
+                {"worker_id": worker_status.worker_id},
+                update,
+                projection=self._WORKER_PROJECTION,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            self._remember_worker_status(worker_status.worker_id, fields)
+            return WorkerStatus.model_construct(**doc) if doc is not None else None
+        except Exception as e:
+            logger.error(f"Failed to update worker status {worker_status.worker_id}: {e}")
+            return None
+    
+    def adjust_worker_task_count(self, worker_id: str, increment: int) -> Optional[WorkerStatus]:
+        """
+        Atomically add to a worker's current task count, never going below zero
+        
+        Returns:
+            Updated worker status, or None if the worker is not registered
+        """
+        try:
+            collection = self.conn.get_collection("worker_status")
+            doc = collection.find_one_and_update(
+                {"worker_id": worker_id},
+                [{"$set": {"current_task_count": {"$max": [
+                    0, {"$add": [{"$ifNull": ["$current_task_count", 0]}, increment]}
+                ]}}}],
+                projection=self._WORKER_PROJECTION,
+                return_document=ReturnDocument.AFTER
+            )
+            # The count changed behind the cached snapshot, resend it on the next write
+            self._last_sent_status.get(worker_id, {}).pop("current_task_count", None)
+            return WorkerStatus.model_construct(**doc) if doc is not None else None
+        except Exception as e:
+            logger.error(f"Failed to adjust task count for worker {worker_id}: {e}")
+            return None
+    
+    def _worker_status_update(self, worker_status: WorkerStatus) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Build the update document for a worker status write
+        
+        Fields equal to the last acknowledged write go to $setOnInsert, so
+        routine heartbeats carry only what changed while an upsert after
+        the document was removed still writes a complete record. Liveness
+        fields are always set.
+        
+        Returns:
+            Tuple of (update document, fields to remember once written)
+        """
+        # Only fields the caller set, so partial updates keep the rest
+        fields = worker_status.model_dump(exclude_unset=True)
+        fields.pop("worker_id", None)
+        heartbeat = fields.pop("last_heartbeat", None)
+        
+        last_sent = self._last_sent_status.get(worker_status.worker_id, {})
+        changed = {
+            k: v for k, v in fields.items()
+            if k in self._WORKER_ALWAYS_SET or k not in last_sent or last_sent[k] != v
+        }
+        unchanged = {k: v for k, v in fields.items() if k not in changed}
+        
+        update: Dict[str, Any] = {}
+        if changed:
+            update["$set"] = changed
+        if unchanged:
+            update["$setOnInsert"] = unchanged
+        if heartbeat is not None:
+            # Stamp heartbeats with the server clock so skewed worker clocks compare consistently
+            update["$currentDate"] = {"last_heartbeat": True}
+        elif not changed:
+            # Nothing new to write, but the update document must not be empty
+            update["$setOnInsert"] = {**unchanged, "worker_id": worker_status.worker_id}
+        return update, fields
+    
+    def _remember_worker_status(self, worker_id: str, fields: Dict[str, Any]):
+        """Record fields as written for later worker status diffs"""
+        self._last_sent_status[worker_id] = {**self._last_sent_status.get(worker_id, {}), **fields}
+    
     def get_worker_status(self, worker_id: str) -> Optional[WorkerStatus]:
         """Get worker status by ID"""
         try:
             collection = self.conn.get_collection("worker_status")
-            doc = collection.find_one({"worker_id": worker_id})
-            return WorkerStatus(**doc) if doc is not None else None
+            doc = collection.find_one({"worker_id": worker_id}, self._WORKER_PROJECTION)
+            return WorkerStatus.model_construct(**doc) if doc is not None else None
         except Exception as e:
             logger.error(f"Failed to get worker status {worker_id}: {e}")
             return None
@@ -242,8 +828,8 @@ class DatabaseOperations:
             docs = collection.find({
                 "is_active": True,
                 "last_heartbeat": {"$gte": threshold}
-            }).sort("last_heartbeat", -1)
-            return [WorkerStatus(**doc) for doc in docs]
+            }, self._WORKER_PROJECTION).sort("last_heartbeat", -1).batch_size(self.list_batch_size)
+            return [WorkerStatus.model_construct(**doc) for doc in docs]
         except Exception as e:
             logger.error(f"Failed to list active workers: {e}")
             return []
@@ -262,55 +848,111 @@ class DatabaseOperations:
     
     # Statistics Operations
     
+    def get_worker_statistics(self, worker_id: str) -> Dict[str, int]:
+        """
+        Get worker execution counts by status
+        
+        Counts are computed server-side in one aggregation and cached for
+        `worker_stats_ttl` seconds.
+        """
+        now = time.monotonic()
+        cached = self._worker_stats_cache.get(worker_id)
+        if cached and cached[0] > now:
+            return dict(cached[1])
+        
+        try:
+            collection = self.conn.get_collection("execution_records")
+            results = collection.aggregate([
+                {"$match": {"worker_id": worker_id}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ])
+            
+            counts = {result["_id"]: result["count"] for result in results}
+            stats = {
+                "current_tasks": counts.get(TaskStatus.RUNNING.value, 0),
+                "total_executed": sum(counts.values()),
+                "successful": counts.get(TaskStatus.SUCCESS.value, 0),
+                "failed": counts.get(TaskStatus.FAILED.value, 0)
+            }
+            
+            self._worker_stats_cache[worker_id] = (now + self.worker_stats_ttl, stats)
+            return dict(stats)
+            
+        except Exception as e:
+            logger.error(f"Failed to get worker statistics {worker_id}: {e}")
+            return {}
+    
     def get_task_statistics(self, task_id: str, days: int = 7) -> Dict[str, Any]:
-        """Get task execution statistics"""
+        """Get task execution statistics, cached per (task, days) for `task_stats_ttl` seconds"""
+        now = time.monotonic()
+        cached = self._task_stats_cache.get((task_id, days))
+        if cached and cached[0] > now:
+            return dict(cached[1])
+        
         try:
             threshold = datetime.utcnow() - timedelta(days=days)
             collection = self.conn.get_collection("execution_records")
             
             pipeline = [
                 {"$match": {"task_id": task_id, "created_at": {"$gte": threshold}}},
-                {"$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1},
-                    "avg_duration": {"$avg": "$duration"},
-                    "total_duration": {"$sum": "$duration"}
-                }}
+                *self._TASK_STATS_STAGES
             ]
             
-            results = list(collection.aggregate(pipeline))
+            stats = next(collection.aggregate(pipeline), None) or dict(self._EMPTY_TASK_STATS)
+            self._task_stats_cache[(task_id, days)] = (now + self.task_stats_ttl, stats)
+            return dict(stats)
             
-            stats = {
-                "total_executions": 0,
-                "successful": 0,
-                "failed": 0,
-                "pending": 0,
-                "running": 0,
-                "avg_duration": 0,
-                "total_duration": 0
-            }
+        except Exception as e:
+            logger.error(f"Failed to get task statistics {task_id}: {e}")
+            return {}
+    
+    def get_task_metadata_with_statistics(
+        self, 
+        task_id: str, 
+        days: int = 7
+    ) -> Tuple[Optional[TaskMetadata], Dict[str, Any]]:
+        """
+        Get task metadata and execution statistics in one round trip
+        
+        Args:
+            task_id: Task identifier
+            days: Statistics window in days
             
-            for result in results:
-                status = result["_id"]
-                count = result["count"]
-                stats["total_executions"] += count
-                
-                if status == TaskStatus.SUCCESS:
-                    stats["successful"] = count
-                    stats["avg_duration"] = result.get("avg_duration", 0)
-                    stats["total_duration"] = result.get("total_duration", 0)
-                elif status == TaskStatus.FAILED:
-                    stats["failed"] = count
-                elif status == TaskStatus.PENDING:
-                    stats["pending"] = count
-                elif status == TaskStatus.RUNNING:
-                    stats["running"] = count
+        Returns:
+            Tuple of (metadata or None if not found, statistics dict)
+        """
+        try:
+            threshold = datetime.utcnow() - timedelta(days=days)
+            collection = self.conn.get_collection("task_metadata")
+            
+            pipeline = [
+                {"$match": {"task_id": task_id}},
+                {"$limit": 1},
+                {"$lookup": {
+                    "from": "execution_records",
+                    "let": {"task_id": "$task_id"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$and": [
+                            {"$eq": ["$task_id", "$$task_id"]},
+                            {"$gte": ["$created_at", threshold]}
+                        ]}}},
+                        *self._TASK_STATS_STAGES
+                    ],
+                    "as": "execution_stats"
+                }}
+            ]
+            
+            doc = next(collection.aggregate(pipeline), None)
+            if doc is None:
+                return None, {}
             
-            return stats
+            execution_stats = doc.pop("execution_stats", [])
+            stats = execution_stats[0] if execution_stats else dict(self._EMPTY_TASK_STATS)
+            return TaskMetadata.model_validate(doc), stats
             
         except Exception as e:
-            logger.error(f"Failed to get task statistics {task_id}: {e}")
-            return {}
+            logger.error(f"Failed to get task metadata with statistics {task_id}: {e}")
+            return None, {}
 
 
 # Global database operations instance
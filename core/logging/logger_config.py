@@ -5,7 +5,9 @@ Centralized logging setup for the AI Task Worker System
 """
 import os
 import sys
+import threading
 from pathlib import Path
+from typing import List, Optional, Tuple
 from loguru import logger
 
 
@@ -27,133 +29,100 @@ class LoggerConfig:
         self.celery_log = self.logs_dir / "celery.log"
         self.system_log = self.logs_dir / "system.log"
 
-    def setup_worker_logging(self, level: str = "INFO", console: bool = True):
+        # Sinks installed by the last setup call and the settings they were made with
+        self._handler_ids: List[int] = []
+        self._configured: Optional[Tuple[str, str, str, bool]] = None
+        self._lock = threading.Lock()
+
+    def _setup(self, component: str, console_label: str, log_file: Path,
+               level: str, console: bool, reconfigure: bool):
+        """
+        Install the console and file sinks for a component
+
+        Repeated calls with the same settings are no-ops. Otherwise only the
+        sinks added here before (and loguru's default stderr sink) are
+        replaced, so sinks added by other code survive.
+        """
+        settings = (component, str(log_file), level, console)
+        with self._lock:
+            if settings == self._configured and not reconfigure:
+                return logger
+
+            if self._configured is None:
+                # Remove loguru's default stderr handler
+                try:
+                    logger.remove(0)
+                except ValueError:
+                    pass
+            for handler_id in self._handler_ids:
+                logger.remove(handler_id)
+            self._handler_ids = []
+
+            # Console logging
+            if console:
+                self._handler_ids.append(logger.add(
+                    sys.stdout,
+                    level=level,
+                    format=f"<green>{{time:YYYY-MM-DD HH:mm:ss}}</green> | <level>{{level: <8}}</level> | {console_label} | {{message}}",
+                    colorize=True
+                ))
+
+            # File logging; enqueued so callers never wait on disk writes or
+            # rotation, and records from forked pool processes stay intact
+            self._handler_ids.append(logger.add(
+                log_file,
+                level=level,
+                format=f"{{time:YYYY-MM-DD HH:mm:ss}} | {{level: <8}} | {component} | {{message}}",
+                rotation="100 MB",
+                retention="30 days",
+                compression="zip",
+                enqueue=True
+            ))
+
+            self._configured = settings
+            return logger
+
+    def setup_worker_logging(self, level: str = "INFO", console: bool = True, reconfigure: bool = False):
         """Setup logging for worker processes"""
-        # Remove default logger
-        logger.remove()
+        return self._setup("WORKER", "<cyan>WORKER</cyan>", self.worker_log, level, console, reconfigure)
 
-        # Console logging
-        if console:
-            logger.add(
-                sys.stdout,
-                level=level,
-                format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>WORKER</cyan> | {message}",
-                colorize=True
-            )
-
-        # File logging
-        logger.add(
-            self.worker_log,
-            level=level,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | WORKER | {message}",
-            rotation="100 MB",
-            retention="30 days",
-            compression="zip"
-        )
-
-        return logger
-
-    def setup_celery_logging(self, level: str = "INFO", console: bool = True):
+    def setup_celery_logging(self, level: str = "INFO", console: bool = True, reconfigure: bool = False):
         """Setup logging for Celery processes"""
-        # Remove default logger
-        logger.remove()
+        return self._setup("CELERY", "<magenta>CELERY</magenta>", self.celery_log, level, console, reconfigure)
 
-        # Console logging
-        if console:
-            logger.add(
-                sys.stdout,
-                level=level,
-                format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <magenta>CELERY</magenta> | {message}",
-                colorize=True
-            )
-
-        # File logging
-        logger.add(
-            self.celery_log,
-            level=level,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | CELERY | {message}",
-            rotation="100 MB",
-            retention="30 days",
-            compression="zip"
-        )
-
-        return logger
-
-    def setup_system_logging(self, level: str = "INFO", console: bool = True):
+    def setup_system_logging(self, level: str = "INFO", console: bool = True, reconfigure: bool = False):
         """Setup logging for system components"""
-        # Remove default logger
-        logger.remove()
+        return self._setup("SYSTEM", "<blue>SYSTEM</blue>", self.system_log, level, console, reconfigure)
 
-        # Console logging
-        if console:
-            logger.add(
-                sys.stdout,
-                level=level,
-                format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <blue>SYSTEM</blue> | {message}",
-                colorize=True
-            )
-
-        # File logging
-        logger.add(
-            self.system_log,
-            level=level,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | SYSTEM | {message}",
-            rotation="100 MB",
-            retention="30 days",
-            compression="zip"
-        )
-
-        return logger
-
-    def setup_generic_logging(self, component: str = "APP", level: str = "INFO", console: bool = True):
+    def setup_generic_logging(self, component: str = "APP", level: str = "INFO", console: bool = True,
+                              reconfigure: bool = False):
         """Setup generic logging for any component"""
-        # Remove default logger
-        logger.remove()
-
-        # Console logging
-        if console:
-            logger.add(
-                sys.stdout,
-                level=level,
-                format=f"<green>{{time:YYYY-MM-DD HH:mm:ss}}</green> | <level>{{level: <8}}</level> | <yellow>{component}</yellow> | {{message}}",
-                colorize=True
-            )
-
-        # File logging - write to system.log for generic components
-        logger.add(
-            self.system_log,
-            level=level,
-            format=f"{{time:YYYY-MM-DD HH:mm:ss}} | {{level: <8}} | {component} | {{message}}",
-            rotation="100 MB",
-            retention="30 days",
-            compression="zip"
-        )
-
-        return logger
+        # Generic components write to system.log
+        return self._setup(component, f"<yellow>{component}</yellow>", self.system_log, level, console, reconfigure)
 
 
 # Global logger config instance
 logger_config = LoggerConfig()
 
 
-def get_worker_logger(level: str = "INFO", console: bool = True):
+def get_worker_logger(level: str = "INFO", console: bool = True, reconfigure: bool = False):
     """Get configured worker logger"""
-    return logger_config.setup_worker_logging(level, console)
+    return logger_config.setup_worker_logging(level, console, reconfigure)
 
 
-def get_celery_logger(level: str = "INFO", console: bool = True):
+def get_celery_logger(level: str = "INFO", console: bool = True, reconfigure: bool = False):
     """Get configured Celery logger"""
-    return logger_config.setup_celery_logging(level, console)
+    return logger_config.setup_celery_logging(level, console, reconfigure)
 
 
-def get_system_logger(level: str = "INFO", console: bool = True):
+def get_system_logger(level: str = "INFO", console: bool = True, reconfigure: bool = False):
     """Get configured system logger"""
-    return logger_config.setup_system_logging(level, console)
+    return logger_config.setup_system_logging(level, console, reconfigure)
 
 
-def get_logger(component: str = "APP", level: str = "INFO", console: bool = True):
+def get_logger(component: str = "APP", level: str = "INFO", console: bool = True, reconfigure: bool = False):
     """Get configured generic logger"""
-    return logger_config.setup_generic_logging(component, level, console)
+    return logger_config.setup_generic_logging(component, level, console, reconfigure)
 
 
 # Environment variable support
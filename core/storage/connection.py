@@ -1,7 +1,13 @@
 """
 MinIO connection management for task storage
 """
-from typing import Optional
+import os
+import threading
+import time
+from typing import Optional, Set
+import certifi
+import urllib3
+from urllib3.util.retry import Retry
 from minio import Minio
 from minio.error import S3Error
 from loguru import logger
@@ -13,39 +19,80 @@ from ..config.manager import get_config
 class MinIOConnection:
     """MinIO connection manager"""
     
+    # Seconds a successful health check is trusted before asking the server again
+    health_check_ttl = 5.0
+    
     def __init__(self, config: Optional[MinIOConfig] = None):
         self.config = config or get_config().worker.minio
         self._client: Optional[Minio] = None
+        self._http: Optional[urllib3.PoolManager] = None
+        self._lock = threading.Lock()
+        self._last_health_ok = 0.0
+        # Buckets confirmed to exist on this connection
+        self._known_buckets: Set[str] = set()
         
     def connect(self) -> bool:
-        """Establish MinIO connection"""
-        try:
-            self._client = Minio(
-                self.config.endpoint,
-                access_key=self.config.access_key,
-                secret_key=self.config.secret_key,
-                secure=self.config.secure,
-                region=self.config.region
-            )
+        """Establish MinIO connection, reusing the existing client if any"""
+        with self._lock:
+            if self._client is not None:
+                return True
             
-            # Test connection by checking if bucket exists or create it
-            if not self._client.bucket_exists(self.config.bucket):
-                self._client.make_bucket(
-                    self.config.bucket,
-                    location=self.config.region
+            try:
+                http = self._build_http_client()
+                client = Minio(
+                    self.config.endpoint,
+                    access_key=self.config.access_key,
+                    secret_key=self.config.secret_key,
+                    secure=self.config.secure,
+                    region=self.config.region,
+                    http_client=http
                 )
-                logger.info(f"Created MinIO bucket: {self.config.bucket}")
-            
-            logger.info(f"Connected to MinIO: {self.config.endpoint}/{self.config.bucket}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to MinIO: {e}")
-            return False
+                
+                # Test connection by checking if bucket exists or create it
+                if not client.bucket_exists(self.config.bucket):
+                    client.make_bucket(
+                        self.config.bucket,
+                        location=self.config.region
+                    )
+                    logger.info(f"Created MinIO bucket: {self.config.bucket}")
+                
+                self._client = client
+                self._http = http
+                self._known_buckets.add(self.config.bucket)
+                self._last_health_ok = time.monotonic()
+                logger.info(f"Connected to MinIO: {self.config.endpoint}/{self.config.bucket}")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Failed to connect to MinIO: {e}")
+                return False
+    
+    def _build_http_client(self) -> urllib3.PoolManager:
+        """Build the HTTP pool, sized for parallel object I/O instead of urllib3's 10"""
+        maxsize = self.config.max_pool_size or max(get_config().worker.max_concurrent_tasks * 2, 10)
+        return urllib3.PoolManager(
+            maxsize=maxsize,
+            block=False,
+            timeout=urllib3.Timeout(connect=self.config.connect_timeout, read=self.config.read_timeout),
+            retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+            # Same trust store the default MinIO client uses
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where()
+        )
+    
+    def _reset(self):
+        """Drop the client so the next access reconnects"""
+        with self._lock:
+            if self._http is not None:
+                self._http.clear()
+            self._client = None
+            self._http = None
+            self._known_buckets.clear()
+            self._last_health_ok = 0.0
     
     def disconnect(self):
         """Close MinIO connection"""
-        self._client = None
+        self._reset()
         logger.info("Disconnected from MinIO")
     
     @property
@@ -57,19 +104,29 @@ class MinIOConnection:
         return self._client
     
     def health_check(self) -> bool:
-        """Check MinIO connection health"""
+        """Check MinIO connection health, trusting a recent success for health_check_ttl"""
+        if self._client is not None and time.monotonic() - self._last_health_ok < self.health_check_ttl:
+            return True
         try:
-            return self.client.bucket_exists(self.config.bucket)
-        except Exception:
-            return False
+            if self.client.bucket_exists(self.config.bucket):
+                self._last_health_ok = time.monotonic()
+                return True
+        except Exception as e:
+            logger.warning(f"MinIO health check failed: {e}")
+        # Reconnect on the next client access
+        self._reset()
+        return False
     
     def create_bucket_if_not_exists(self, bucket_name: Optional[str] = None) -> bool:
         """Create bucket if it doesn't exist"""
         try:
             bucket = bucket_name or self.config.bucket
+            if bucket in self._known_buckets:
+                return True
             if not self.client.bucket_exists(bucket):
                 self.client.make_bucket(bucket, location=self.config.region)
                 logger.info(f"Created bucket: {bucket}")
+            self._known_buckets.add(bucket)
             return True
         except Exception as e:
             logger.error(f"Failed to create bucket {bucket_name}: {e}")
@@ -78,13 +135,16 @@ class MinIOConnection:
 
 # Global connection instance
 _minio_connection: Optional[MinIOConnection] = None
+_minio_connection_lock = threading.Lock()
 
 
 def get_minio_connection() -> MinIOConnection:
     """Get global MinIO connection"""
     global _minio_connection
     if not _minio_connection:
-        _minio_connection = MinIOConnection()
+        with _minio_connection_lock:
+            if not _minio_connection:
+                _minio_connection = MinIOConnection()
     return _minio_connection
 
 
@@ -1,38 +1,304 @@
 """
 MinIO storage operations for task and pipeline files
 """
+import inspect
 import os
 import zipfile
 import tempfile
 import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any, BinaryIO
+from typing import Optional, List, Dict, Any, BinaryIO, Iterator, Tuple
 from io import BytesIO
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from loguru import logger
 
 from .connection import get_minio_connection
 
+try:
+    # SIMD-accelerated drop-in for zlib, used for package deflate only
+    from zlib_ng import zlib_ng
+except ImportError:
+    zlib_ng = None
+
+
+def _walk_files(root: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, archive name) for every file under root
+    
+    Uses os.scandir, whose entries carry their file type, instead of
+    building and stat-ing a Path per entry. Entries are visited in name
+    order so the same folder always produces the same archive.
+    """
+    prefix_len = len(root.rstrip(os.sep)) + 1
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                yield entry.path, entry.path[prefix_len:].replace(os.sep, '/')
+        # Reversed so directories pop off the stack in name order
+        stack.extend(reversed(subdirs))
+
+
+class _HashingWriter:
+    """
+    Write-only stream that hashes bytes on their way to the target file
+    
+    It deliberately has no seek/tell, so ZipFile writes in streaming mode
+    and never rewrites bytes that were already hashed.
+    """
+    
+    def __init__(self, target: BinaryIO):
+        self.target = target
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.target.write(data)
+    
+    def flush(self):
+        self.target.flush()
+
+
+def _zipfile_write_hook_supported() -> bool:
+    """
+    Check that zipfile's private write path looks the way _PackageZipFile expects
+    
+    zipfile offers no public hook for the compressor. _PackageZipFile relies
+    on ZipFile._open_to_write(zinfo, force_zip64) returning a writer that
+    holds its compressor in _compressor, as on CPython 3.8 to 3.13; any
+    other shape keeps the standard zlib.
+    """
+    try:
+        params = list(inspect.signature(zipfile.ZipFile._open_to_write).parameters)
+        writer_init = inspect.getsource(zipfile._ZipWriteFile.__init__)
+    except (AttributeError, TypeError, ValueError, OSError):
+        return False
+    return params == ["self", "zinfo", "force_zip64"] and "self._compressor" in writer_init
+
+
+# zlib_ng is used only where zipfile's internals match what _PackageZipFile expects
+_USE_ZLIB_NG = zlib_ng is not None and _zipfile_write_hook_supported()
+
+
+class _PackageZipFile(zipfile.ZipFile):
+    """
+    ZipFile that deflates with zlib_ng when it is installed
+    
+    Only entries written through this class get the zlib_ng compressor;
+    every other zipfile user in the process keeps the standard zlib.
+    """
+    
+    def _open_to_write(self, zinfo, force_zip64=False):
+        dest = super()._open_to_write(zinfo, force_zip64)
+        if (_USE_ZLIB_NG and zinfo.compress_type == zipfile.ZIP_DEFLATED
+                and getattr(dest, "_compressor", None) is not None):
+            # Python 3.13 renamed ZipInfo._compresslevel to compress_level
+            level = getattr(zinfo, "compress_level", getattr(zinfo, "_compresslevel", None))
+            dest._compressor = zlib_ng.compressobj(
+                zlib_ng.Z_DEFAULT_COMPRESSION if level is None else level, zlib_ng.DEFLATED, -15
+            )
+        return dest
+
 
 class StorageOperations:
     """Storage operations manager"""
     
+    # Packages up to this size are buffered in memory while downloading
+    package_spool_size = 32 * 1024 * 1024
+    stream_chunk_size = 64 * 1024
+    hash_chunk_size = 1024 * 1024
+    # Deflate level for packages; source files shrink almost as well at 1 as at the
+    # default 6, for a fraction of the CPU
+    package_compress_level = 1
+    # Already compressed formats are stored as is, deflating them again gains nothing
+    stored_extensions = frozenset({
+        '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z',
+        '.pt', '.pth', '.onnx', '.bin', '.safetensors', '.h5', '.pb', '.tflite',
+        '.jpg', '.jpeg', '.png', '.webp', '.gif', '.mp4', '.whl'
+    })
+    # Multipart transfer settings; objects above the threshold are fetched in ranges
+    transfer_part_size = 8 * 1024 * 1024
+    parallel_transfers = 4
+    parallel_download_threshold = 64 * 1024 * 1024
+    # Downloads start over this many times when the object is replaced mid-transfer
+    download_attempts = 3
+    # Uploads grow their part size to stay within this many parts
+    max_upload_parts = 1000
+    # Where packages live; the bucket also holds other objects, such as
+    # spilled execution outputs under executions/, that cleanup must not touch
+    package_prefixes = ("tasks/", "pipelines/")
+    
     def __init__(self):
         self.conn = get_minio_connection()
         self.bucket = self.conn.config.bucket
     
+    def _stream_and_extract(self, storage_path: str, extract_path: Path):
+        """Stream ZIP object from MinIO and extract it without staging a temp file"""
+        with tempfile.SpooledTemporaryFile(max_size=self.package_spool_size) as buffer:
+            self._download_to(storage_path, buffer)
+            buffer.seek(0)
+            
+            with zipfile.ZipFile(buffer, 'r') as zipf:
+                zipf.extractall(extract_path)
+    
+    def _iter_object(self, storage_path: str, chunk_size: Optional[int] = None,
+                     parallel: bool = True) -> Iterator[bytes]:
+        """
+        Yield an object's bytes in order
+        
+        With parallel, a HEAD request sizes the object and large objects are
+        fetched as concurrent ranged GETs pinned to its ETag; if the object
+        is replaced mid-download the server answers 412 and S3Error
+        PreconditionFailed is raised instead of old and new bytes being
+        mixed. Without it, one plain GET and no HEAD.
+        """
+        size = etag = None
+        if parallel:
+            stat = self.conn.client.stat_object(self.bucket, storage_path)
+            size, etag = stat.size, stat.etag
+        if size is None or size < self.parallel_download_threshold:
+            response = self.conn.client.get_object(self.bucket, storage_path)
+            try:
+                for chunk in response.stream(chunk_size or self.stream_chunk_size):
+                    yield chunk
+            finally:
+                response.close()
+                response.release_conn()
+            return
+        
+        ranges = deque(
+            (offset, min(self.transfer_part_size, size - offset))
+            for offset in range(0, size, self.transfer_part_size)
+        )
+        with ThreadPoolExecutor(max_workers=self.parallel_transfers) as pool:
+            # Bounded window of in-flight parts, so a slow consumer never
+            # has the whole object buffered in memory
+            pending = deque()
+            while ranges or pending:
+                while ranges and len(pending) < self.parallel_transfers * 2:
+                    pending.append(pool.submit(self._fetch_range, storage_path, *ranges.popleft(), etag))
+                yield pending.popleft().result()
+    
+    def _download_to(self, storage_path: str, buffer: BinaryIO, parallel: bool = True):
+        """Download an object into a writable file, starting over if it is replaced meanwhile"""
+        for attempt in range(1, self.download_attempts + 1):
+            try:
+                for chunk in self._iter_object(storage_path, parallel=parallel):
+                    buffer.write(chunk)
+                return
+            except S3Error as e:
+                if e.code != "PreconditionFailed" or attempt == self.download_attempts:
+                    raise
+                logger.warning(f"Object {storage_path} changed during download, starting over")
+                buffer.seek(0)
+                buffer.truncate()
+    
+    def _upload_part_size(self, size: int) -> int:
+        """Part size for a multipart upload, grown in whole MiB for very large objects"""
+        mib = 1024 * 1024
+        part_size = -(-size // self.max_upload_parts)
+        return max(self.transfer_part_size, -(-part_size // mib) * mib)
+    
+    def _fetch_range(self, storage_path: str, offset: int, length: int, etag: Optional[str] = None) -> bytes:
+        """Fetch one byte range of an object, only from the version with this ETag if given"""
+        headers = {"If-Match": f'"{etag}"'} if etag else None
+        response = self.conn.client.get_object(
+            self.bucket, storage_path, offset=offset, length=length, request_headers=headers
+        )
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+    
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file"""
-        hash_sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashes straight from the file in C
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            
+            hash_sha256 = hashlib.sha256()
+            buffer = bytearray(self.hash_chunk_size)
+            view = memoryview(buffer)
+            # Large reads into one reused buffer; sha256 releases the GIL per update
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hash_sha256.update(view[:n])
         return hash_sha256.hexdigest()
     
     def _calculate_bytes_hash(self, data: bytes) -> str:
         """Calculate SHA256 hash of bytes"""
         return hashlib.sha256(data).hexdigest()
     
+    def _zip_folder(self, folder: Path, target: BinaryIO) -> Tuple[str, int]:
+        """
+        Write a folder as a ZIP archive into target in a single pass
+        
+        Returns:
+            Tuple of (SHA256 hex digest, size in bytes) of the archive
+        """
+        writer = _HashingWriter(target)
+        with _PackageZipFile(writer, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=self.package_compress_level) as zipf:
+            for file_path, arcname in _walk_files(str(folder)):
+                compress_type = (
+                    zipfile.ZIP_STORED if os.path.splitext(arcname)[1].lower() in self.stored_extensions
+                    else zipfile.ZIP_DEFLATED
+                )
+                zipf.write(file_path, arcname, compress_type=compress_type)
+        return writer.sha256.hexdigest(), writer.size
+    
+    def _stored_package_hash(self, object_name: str) -> Optional[str]:
+        """
+        SHA256 recorded on an uploaded package object, or None if unknown
+        
+        Always asked of storage (one HEAD request), since other processes
+        and tools/task_manager.py overwrite and delete packages too.
+        """
+        try:
+            stat = self.conn.client.stat_object(self.bucket, object_name)
+        except S3Error:
+            return None
+        return stat.metadata.get("x-amz-meta-sha256")
+    
+    def _upload_package(self, folder: Path, object_name: str) -> Dict[str, Any]:
+        """Zip a folder and upload it, hashing the archive while it is written"""
+        with tempfile.SpooledTemporaryFile(max_size=self.package_spool_size) as buffer:
+            file_hash, file_size = self._zip_folder(folder, buffer)
+            if self._stored_package_hash(object_name) == file_hash:
+                logger.info(f"Package unchanged, skipping upload: {object_name}")
+            else:
+                buffer.seek(0)
+                self.conn.client.put_object(
+                    self.bucket,
+                    object_name,
+                    buffer,
+                    file_size,
+                    content_type='application/zip',
+                    metadata={"sha256": file_hash},
+                    part_size=self._upload_part_size(file_size),
+                    num_parallel_uploads=self.parallel_transfers
+                )
+        
+        return {
+            "storage_path": object_name,
+            "file_hash": file_hash,
+            "file_size": file_size
+        }
+    
     def upload_task_package(self, task_id: str, task_folder: str) -> Optional[Dict[str, Any]]:
         """
         Upload task package as ZIP file
@@ -49,48 +315,11 @@ class StorageOperations:
             if not task_path.exists():
                 raise FileNotFoundError(f"Task folder not found: {task_folder}")
             
-            # Create temporary ZIP file
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-                zip_path = tmp_file.name
+            object_name = f"tasks/{task_id}/{task_id}_v1.0.0.zip"
+            result = self._upload_package(task_path, object_name)
+            logger.info(f"Uploaded task package: {object_name}")
+            return result
             
-            try:
-                # Create ZIP archive
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in task_path.rglob('*'):
-                        if file_path.is_file():
-                            # Add file to zip with relative path
-                            arcname = file_path.relative_to(task_path)
-                            zipf.write(file_path, arcname)
-                
-                # Calculate file info
-                file_size = os.path.getsize(zip_path)
-                file_hash = self._calculate_file_hash(zip_path)
-                
-                # Upload to MinIO
-                object_name = f"tasks/{task_id}/{task_id}_v1.0.0.zip"
-                
-                with open(zip_path, 'rb') as file_data:
-                    self.conn.client.put_object(
-                        self.bucket,
-                        object_name,
-                        file_data,
-                        file_size,
-                        content_type='application/zip'
-                    )
-                
-                logger.info(f"Uploaded task package: {object_name}")
-                
-                return {
-                    "storage_path": object_name,
-                    "file_hash": file_hash,
-                    "file_size": file_size
-                }
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(zip_path):
-                    os.unlink(zip_path)
-                
         except Exception as e:
             logger.error(f"Failed to upload task package {task_id}: {e}")
             return None
@@ -111,48 +340,11 @@ class StorageOperations:
             if not pipeline_path.exists():
                 raise FileNotFoundError(f"Pipeline folder not found: {pipeline_folder}")
             
-            # Create temporary ZIP file
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-                zip_path = tmp_file.name
+            object_name = f"pipelines/{pipeline_id}/{pipeline_id}_v1.0.0.zip"
+            result = self._upload_package(pipeline_path, object_name)
+            logger.info(f"Uploaded pipeline package: {object_name}")
+            return result
             
-            try:
-                # Create ZIP archive
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in pipeline_path.rglob('*'):
-                        if file_path.is_file():
-                            # Add file to zip with relative path
-                            arcname = file_path.relative_to(pipeline_path)
-                            zipf.write(file_path, arcname)
-                
-                # Calculate file info
-                file_size = os.path.getsize(zip_path)
-                file_hash = self._calculate_file_hash(zip_path)
-                
-                # Upload to MinIO
-                object_name = f"pipelines/{pipeline_id}/{pipeline_id}_v1.0.0.zip"
-                
-                with open(zip_path, 'rb') as file_data:
-                    self.conn.client.put_object(
-                        self.bucket,
-                        object_name,
-                        file_data,
-                        file_size,
-                        content_type='application/zip'
-                    )
-                
-                logger.info(f"Uploaded pipeline package: {object_name}")
-                
-                return {
-                    "storage_path": object_name,
-                    "file_hash": file_hash,
-                    "file_size": file_size
-                }
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(zip_path):
-                    os.unlink(zip_path)
-                
         except Exception as e:
             logger.error(f"Failed to upload pipeline package {pipeline_id}: {e}")
             return None
@@ -172,24 +364,10 @@ class StorageOperations:
             extract_path = Path(extract_to)
             extract_path.mkdir(parents=True, exist_ok=True)
             
-            # Download file
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-                zip_path = tmp_file.name
+            self._stream_and_extract(storage_path, extract_path)
             
-            try:
-                self.conn.client.fget_object(self.bucket, storage_path, zip_path)
-                
-                # Extract ZIP file
-                with zipfile.ZipFile(zip_path, 'r') as zipf:
-                    zipf.extractall(extract_path)
-                
-                logger.info(f"Downloaded and extracted pipeline package to: {extract_path}")
-                return True
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(zip_path):
-                    os.unlink(zip_path)
+            logger.info(f"Downloaded and extracted pipeline package to: {extract_path}")
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to download pipeline package {storage_path}: {e}")
@@ -207,18 +385,37 @@ class StorageOperations:
             True if hash matches, False otherwise
         """
         try:
-            # Download file to memory and calculate hash
-            response = self.conn.client.get_object(self.bucket, storage_path)
-            data = response.read()
-            response.close()
+            # Hash the object as it streams in rather than holding it in memory;
+            # one sequential GET, so the hash always covers a single version
+            hash_sha256 = hashlib.sha256()
+            for chunk in self._iter_object(storage_path, self.hash_chunk_size, parallel=False):
+                hash_sha256.update(chunk)
             
-            actual_hash = self._calculate_bytes_hash(data)
-            return actual_hash == expected_hash
+            return hash_sha256.hexdigest() == expected_hash
             
         except Exception as e:
             logger.error(f"Failed to verify file integrity {storage_path}: {e}")
             return False
     
+    def _list_packages(self, prefix: str, kind: str) -> List[Dict[str, Any]]:
+        """List ZIP packages under a prefix in one paginated listing"""
+        try:
+            objects = self.conn.client.list_objects(self.bucket, prefix=prefix, recursive=True)
+            return [
+                {
+                    "name": obj.object_name,
+                    "size": obj.size,
+                    "last_modified": obj.last_modified,
+                    "etag": obj.etag
+                }
+                for obj in objects
+                if obj.object_name.endswith('.zip')
+            ]
+            
+        except Exception as e:
+            logger.error(f"Failed to list {kind} packages: {e}")
+            return []
+    
     def list_task_packages(self, prefix: str = "tasks/") -> List[Dict[str, Any]]:
         """
         List all task packages in storage
@@ -229,24 +426,7 @@ class StorageOperations:
         Returns:
             List of package info dictionaries
         """
-        try:
-            objects = self.conn.client.list_objects(self.bucket, prefix=prefix, recursive=True)
-            packages = []
-            
-            for obj in objects:
-                if obj.object_name.endswith('.zip'):
-                    packages.append({
-                        "name": obj.object_name,
-                        "size": obj.size,
-                        "last_modified": obj.last_modified,
-                        "etag": obj.etag
-                    })
-            
-            return packages
-            
-        except Exception as e:
-            logger.error(f"Failed to list task packages: {e}")
-            return []
+        return self._list_packages(prefix, "task")
     
     def list_pipeline_packages(self, prefix: str = "pipelines/") -> List[Dict[str, Any]]:
         """
@@ -258,24 +438,7 @@ class StorageOperations:
         Returns:
             List of package info dictionaries
         """
-        try:
-            objects = self.conn.client.list_objects(self.bucket, prefix=prefix, recursive=True)
-            packages = []
-            
-            for obj in objects:
-                if obj.object_name.endswith('.zip'):
-                    packages.append({
-                        "name": obj.object_name,
-                        "size": obj.size,
-                        "last_modified": obj.last_modified,
-                        "etag": obj.etag
-                    })
-            
-            return packages
-            
-        except Exception as e:
-            logger.error(f"Failed to list pipeline packages: {e}")
-            return []
+        return self._list_packages(prefix, "pipeline")
     
     def delete_package(self, storage_path: str) -> bool:
         """
@@ -320,6 +483,31 @@ class StorageOperations:
             logger.error(f"Failed to get package info {storage_path}: {e}")
             return None
     
+    def get_package_url(self, storage_path: str, expires: int = 300) -> Optional[str]:
+        """
+        Get a pre-signed download URL for a package
+        
+        Clients fetch the object straight from MinIO, so no package bytes
+        pass through this process.
+        
+        Args:
+            storage_path: MinIO object path
+            expires: URL lifetime in seconds
+            
+        Returns:
+            Pre-signed URL or None if failed
+        """
+        try:
+            from datetime import timedelta
+            
+            return self.conn.client.presigned_get_object(
+                self.bucket, storage_path, expires=timedelta(seconds=expires)
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to get package URL {storage_path}: {e}")
+            return None
+    
     def upload_file(self, file_path: str, object_name: str) -> Optional[Dict[str, Any]]:
         """
         Upload arbitrary file to storage
@@ -340,7 +528,9 @@ class StorageOperations:
                     self.bucket,
                     object_name,
                     file_data,
-                    file_size
+                    file_size,
+                    part_size=self._upload_part_size(file_size),
+                    num_parallel_uploads=self.parallel_transfers
                 )
             
             logger.info(f"Uploaded file: {object_name}")
@@ -370,7 +560,15 @@ class StorageOperations:
             # Ensure directory exists
             Path(file_path).parent.mkdir(parents=True, exist_ok=True)
             
-            self.conn.client.fget_object(self.bucket, object_name, file_path)
+            # Write next to the target and rename, so failures leave no partial file
+            part_path = f"{file_path}.part"
+            try:
+                with open(part_path, 'wb') as file_data:
+                    self._download_to(object_name, file_data)
+                os.replace(part_path, file_path)
+            finally:
+                if os.path.exists(part_path):
+                    os.unlink(part_path)
             logger.info(f"Downloaded file: {object_name} -> {file_path}")
             return True
             
@@ -378,6 +576,33 @@ class StorageOperations:
             logger.error(f"Failed to download file {object_name}: {e}")
             return False
     
+    def upload_bytes(self, object_name: str, data: bytes,
+                     content_type: str = "application/octet-stream") -> bool:
+        """Upload an in-memory payload to storage"""
+        try:
+            self.conn.client.put_object(
+                self.bucket,
+                object_name,
+                BytesIO(data),
+                len(data),
+                content_type=content_type
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upload object {object_name}: {e}")
+            return False
+    
+    def download_bytes(self, object_name: str) -> Optional[bytes]:
+        """Download an object into memory"""
+        try:
+            # In-memory payloads are small, one GET without a HEAD first
+            buffer = BytesIO()
+            self._download_to(object_name, buffer, parallel=False)
+            return buffer.getvalue()
+        except Exception as e:
+            logger.error(f"Failed to download object {object_name}: {e}")
+            return None
+    
     def cleanup_old_packages(self, days: int = 30) -> int:
         """
         Cleanup old packages based on age
@@ -389,21 +614,29 @@ class StorageOperations:
             Number of packages deleted
         """
         try:
-            from datetime import datetime, timedelta
+            from datetime import datetime, timedelta, timezone
             
-            threshold = datetime.utcnow() - timedelta(days=days)
-            objects = self.conn.client.list_objects(self.bucket, recursive=True)
-            deleted_count = 0
+            # MinIO reports last_modified as an aware UTC datetime
+            threshold = datetime.now(timezone.utc) - timedelta(days=days)
+            stale_names: List[str] = []
             
-            for obj in objects:
-                if obj.last_modified < threshold:
-                    try:
-                        self.conn.client.remove_object(self.bucket, obj.object_name)
-                        deleted_count += 1
-                        logger.info(f"Cleaned up old package: {obj.object_name}")
-                    except Exception as e:
-                        logger.error(f"Failed to delete old package {obj.object_name}: {e}")
+            def stale():
+                for prefix in self.package_prefixes:
+                    for obj in self.conn.client.list_objects(self.bucket, prefix=prefix, recursive=True):
+                        if obj.object_name.endswith(".zip") and obj.last_modified < threshold:
+                            stale_names.append(obj.object_name)
+                            yield DeleteObject(obj.object_name)
             
+            # remove_objects sends up to 1000 keys per request; it is lazy,
+            # so the returned errors must be consumed for the deletes to run
+            failed = set()
+            for error in self.conn.client.remove_objects(self.bucket, stale()):
+                failed.add(error.name)
+                logger.error(f"Failed to delete old package {error.name}: {error.message}")
+            
+            deleted_count = sum(1 for name in stale_names if name not in failed)
+            
+            logger.info(f"Cleaned up {deleted_count} old packages")
             return deleted_count
             
         except Exception as e:
@@ -428,25 +661,10 @@ class StorageOperations:
             extract_path = Path(extract_to)
             extract_path.mkdir(parents=True, exist_ok=True)
             
-            # Download file
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-                zip_path = tmp_file.name
+            self._stream_and_extract(storage_path, extract_path)
             
-            try:
-                self.conn.client.fget_object(self.bucket, storage_path, zip_path)
-                
-                # Extract ZIP file
-                # storage_ops = StorageOperations()
-                with zipfile.ZipFile(zip_path,  'r') as zipf:
-                    zipf.extractall(extract_path)
-                
-                logger.info(f"Downloaded and extracted task package to: {extract_path}")
-                return True
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(zip_path):
-                    os.unlink(zip_path)
+            logger.info(f"Downloaded and extracted task package to: {extract_path}")
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to download task package {storage_path}: {e}")
@@ -4,22 +4,39 @@ Task cache management for local storage
 import os
 import shutil
 import json
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from loguru import logger
 
+try:
+    # Several times faster than json for dumping the index
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class TaskCache:
     """Task cache manager for local file system storage"""
     
+    # Package hash written into each committed cache directory
+    HASH_FILE = ".hash"
+    # Seconds to wait for further changes before writing the index
+    save_delay = 1.0
+    
     def __init__(self, cache_dir: str):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_index_file = self.cache_dir / "cache_index.json"
         self._cache_index = self._load_cache_index()
+        self._index_lock = threading.RLock()
+        # Coalesced index writes
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
     
-    def _load_cache_index(self) -> Dict[str, Dict[str, str]]:
+    def _load_cache_index(self) -> Dict[str, Dict[str, Any]]:
         """Load cache index from file"""
         try:
             if self.cache_index_file.exists():
@@ -31,17 +48,99 @@ class TaskCache:
             return {}
     
     def _save_cache_index(self):
-        """Save cache index to file"""
+        """Mark the index dirty and write it once changes settle"""
+        with self._index_lock:
+            self._dirty = True
+            if self._save_timer:
+                self._save_timer.cancel()
+            # Non-daemon, so a pending write still lands before interpreter exit
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.start()
+    
+    def flush(self) -> bool:
+        """Write pending index changes now, via a temp file and atomic rename"""
         try:
-            with open(self.cache_index_file, 'w') as f:
-                json.dump(self._cache_index, f, indent=2)
+            with self._index_lock:
+                if self._save_timer:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return True
+                
+                if orjson is not None:
+                    data = orjson.dumps(self._cache_index, option=orjson.OPT_INDENT_2)
+                else:
+                    data = json.dumps(self._cache_index, indent=2).encode('utf-8')
+                
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".cache_index.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, self.cache_index_file)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+                self._dirty = False
+                return True
         except Exception as e:
             logger.error(f"Failed to save cache index: {e}")
+            return False
+    
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        """Total size of files under a directory, walked with scandir"""
+        total = 0
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+            except FileNotFoundError:
+                continue
+        return total
     
     def get_cache_path(self, item_id: str) -> str:
         """Get cache path for item"""
         return str(self.cache_dir / item_id)
     
+    def get_staging_path(self, item_id: str) -> str:
+        """Get an empty directory to download an item into before committing it"""
+        staging_path = self.cache_dir / f".{item_id}.staging"
+        if staging_path.exists():
+            shutil.rmtree(staging_path)
+        return str(staging_path)
+    
+    def commit_staged(self, item_id: str, file_hash: str) -> str:
+        """
+        Move a staged download into place and record its package hash
+        
+        The previous copy is renamed aside before the swap, so readers
+        never see a half-extracted directory.
+        
+        Returns:
+            Final cache path
+        """
+        staging_path = self.cache_dir / f".{item_id}.staging"
+        cache_path = Path(self.get_cache_path(item_id))
+        old_path = self.cache_dir / f".{item_id}.old"
+        
+        (staging_path / self.HASH_FILE).write_text(file_hash)
+        
+        if old_path.exists():
+            shutil.rmtree(old_path)
+        if cache_path.exists():
+            os.replace(cache_path, old_path)
+        os.replace(staging_path, cache_path)
+        if old_path.exists():
+            shutil.rmtree(old_path, ignore_errors=True)
+        
+        return str(cache_path)
+    
     def is_cached(self, item_id: str) -> bool:
         """Check if item is cached"""
         cache_path = Path(self.get_cache_path(item_id))
@@ -49,14 +148,18 @@ class TaskCache:
     
     def mark_cached(self, item_id: str, metadata: Optional[Dict[str, str]] = None):
         """Mark item as cached in index"""
-        self._cache_index[item_id] = {
-            "cached_at": datetime.utcnow().isoformat(),
-            "path": self.get_cache_path(item_id),
-            **(metadata or {})
-        }
-        self._save_cache_index()
-    
-    def get_cache_info(self, item_id: str) -> Optional[Dict[str, str]]:
+        cache_path = self.get_cache_path(item_id)
+        size_bytes = self._dir_size(cache_path)
+        with self._index_lock:
+            self._cache_index[item_id] = {
+                "cached_at": datetime.utcnow().isoformat(),
+                "path": cache_path,
+                "size_bytes": size_bytes,
+                **(metadata or {})
+            }
+            self._save_cache_index()
+    
+    def get_cache_info(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Get cache information for item"""
         return self._cache_index.get(item_id)
     
@@ -97,20 +200,32 @@ class TaskCache:
         return list(self._cache_index.keys())
     
     def get_cache_size(self) -> int:
-        """Get total cache size in bytes"""
+        """Get total cache size in bytes, from sizes recorded when items were cached"""
         try:
-            total_size = 0
-            for item_id in self._cache_index:
-                cache_path = Path(self.get_cache_path(item_id))
-                if cache_path.exists():
-                    for file_path in cache_path.rglob('*'):
-                        if file_path.is_file():
-                            total_size += file_path.stat().st_size
-            return total_size
+            with self._index_lock:
+                # Entries written before sizes were recorded are measured once
+                missing = [item_id for item_id, info in self._cache_index.items() if "size_bytes" not in info]
+                if missing:
+                    for item_id in missing:
+                        self._cache_index[item_id]["size_bytes"] = self._dir_size(self.get_cache_path(item_id))
+                    self._save_cache_index()
+                return sum(info["size_bytes"] for info in self._cache_index.values())
         except Exception as e:
             logger.error(f"Failed to calculate cache size: {e}")
             return 0
     
+    def recalc_sizes(self) -> int:
+        """Re-measure every cached item on disk, returns the new total in bytes"""
+        try:
+            with self._index_lock:
+                for item_id, info in self._cache_index.items():
+                    info["size_bytes"] = self._dir_size(self.get_cache_path(item_id))
+                self._save_cache_index()
+                return sum(info["size_bytes"] for info in self._cache_index.values())
+        except Exception as e:
+            logger.error(f"Failed to recalculate cache sizes: {e}")
+            return 0
+    
     def cleanup_old_cache(self, days: int = 7) -> int:
         """Cleanup cache items older than specified days"""
         try:
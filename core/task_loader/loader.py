@@ -4,9 +4,12 @@ Dynamic task and pipeline loader with caching
 import os
 import sys
 import json
+import hashlib
 import importlib
 import importlib.util
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Type
 from loguru import logger
@@ -18,6 +21,10 @@ from .cache import TaskCache
 from .validator import TaskValidator
 
 
+# Packages import shared code (e.g. tasks.base) by absolute path from here
+PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+
+
 class TaskLoader:
     """Dynamic task loader with caching and validation"""
     
@@ -28,6 +35,165 @@ class TaskLoader:
         self.validator = TaskValidator()
         self._loaded_tasks: Dict[str, Any] = {}
         self._loaded_pipelines: Dict[str, Any] = {}
+        # Module import touches sys.path and pip shares site-packages,
+        # so both stay serialized when loading in parallel
+        self._import_lock = threading.Lock()
+        self._install_lock = threading.Lock()
+        # Resolved classes by (item ID, package hash); an unchanged package is never re-imported
+        self._class_cache: Dict[tuple, type] = {}
+        # Package hash of verified downloads left staged by _prefetch_package,
+        # by staging path; load_task/load_pipeline commit them after validation
+        self._prefetched: Dict[str, str] = {}
+        # One empty marker per requirements content already installed into this interpreter
+        self._requirements_marker_dir = Path(self.config.task_cache_dir) / ".requirements"
+        
+        # Added once for every task and pipeline instead of checked on each import
+        if PROJECT_ROOT not in sys.path:
+            sys.path.insert(0, PROJECT_ROOT)
+    
+    # Upper bound on concurrent downloads when preloading
+    max_parallel_loads = 8
+    
+    # Flags shared by every pip invocation
+    PIP_INSTALL = ["-m", "pip", "install", "--no-input", "--disable-pip-version-check",
+                   "--prefer-binary", "-q"]
+    
+    def load_tasks(self, task_ids: List[str]) -> Dict[str, Any]:
+        """
+        Load several tasks at once
+        
+        Stale packages are downloaded concurrently, their requirements are
+        installed with a single pip run, then the tasks are imported from
+        the cache.
+        
+        Returns:
+            Dict of task ID to task instance for tasks that loaded
+        """
+        return self._load_many(
+            task_ids, self._loaded_tasks, self.task_cache,
+            db_ops.get_task_metadata, storage_ops.download_task_package, self.load_task
+        )
+    
+    def load_pipelines(self, pipeline_ids: List[str]) -> Dict[str, Any]:
+        """Load several pipelines at once, see load_tasks"""
+        return self._load_many(
+            pipeline_ids, self._loaded_pipelines, self.pipeline_cache,
+            db_ops.get_pipeline_metadata, storage_ops.download_pipeline_package, self.load_pipeline
+        )
+    
+    def _load_many(self, item_ids: List[str], loaded: Dict[str, Any], cache: TaskCache,
+                   get_metadata, download, load_fn) -> Dict[str, Any]:
+        """Prefetch packages in parallel, batch-install requirements, then load each item"""
+        item_ids = [item_id for item_id in dict.fromkeys(item_ids) if item_id not in loaded]
+        
+        if item_ids:
+            with ThreadPoolExecutor(max_workers=min(self.max_parallel_loads, len(item_ids))) as pool:
+                fetched = pool.map(
+                    lambda item_id: self._prefetch_package(item_id, cache, get_metadata, download),
+                    item_ids
+                )
+                requirement_files = [path for path in fetched if path]
+            
+            # load_fn installs each package's requirements before importing it,
+            # skipping those the batch installed; after a failed batch every
+            # package is retried on its own, so one bad pin fails only its item
+            if requirement_files and not self._install_requirement_files(requirement_files):
+                logger.warning("Batched requirements install failed, installing packages one by one")
+        
+        results = {}
+        for item_id in item_ids:
+            instance = load_fn(item_id)
+            if instance:
+                results[item_id] = instance
+        return results
+    
+    def _prefetch_package(self, item_id: str, cache: TaskCache, get_metadata, download) -> Optional[Path]:
+        """
+        Download an item's package if the cache is missing or stale
+        
+        The verified download stays staged; the following load_task or
+        load_pipeline commits it to the cache only once it validates.
+        
+        Returns:
+            Requirements file of a freshly fetched package, if it has one
+        """
+        try:
+            metadata = get_metadata(item_id)
+            if not metadata:
+                return None
+            
+            cache_path = cache.get_cache_path(item_id)
+            if cache.is_cached(item_id) and self._verify_cache_integrity(cache_path, metadata.file_hash):
+                return None
+            
+            staging_path = cache.get_staging_path(item_id)
+            if not download(metadata.storage_path, staging_path):
+                return None
+            if not storage_ops.verify_file_integrity(metadata.storage_path, metadata.file_hash):
+                logger.error(f"Package integrity check failed: {item_id}")
+                return None
+            
+            self._prefetched[staging_path] = metadata.file_hash
+            
+            requirements_file = Path(staging_path) / "requirements.txt"
+            return requirements_file if requirements_file.exists() else None
+            
+        except Exception as e:
+            logger.error(f"Failed to prefetch package {item_id}: {e}")
+            return None
+    
+    def _install_requirement_files(self, requirement_files: List[Path]) -> bool:
+        """Install several requirements files with one pip run"""
+        pending = {}
+        for requirements_file in requirement_files:
+            marker = self._requirements_marker(requirements_file)
+            if not marker.exists():
+                pending.setdefault(marker, requirements_file)
+        
+        if not pending:
+            return True
+        
+        args = []
+        for requirements_file in pending.values():
+            args.extend(["-r", str(requirements_file)])
+        
+        with self._install_lock:
+            result = subprocess.run(
+                [sys.executable, *self.PIP_INSTALL, *args],
+                capture_output=True, text=True
+            )
+        
+        if result.returncode != 0:
+            logger.error(f"Failed to install batched requirements: {result.stderr}")
+            return False
+        
+        for marker in pending:
+            self._mark_requirements_installed(marker)
+        
+        logger.info(f"Installed requirements for {len(pending)} packages")
+        return True
+    
+    def _take_prefetched(self, cache: TaskCache, item_id: str, file_hash: str) -> Optional[str]:
+        """Staging path of a prefetched download of this package hash, if one is waiting"""
+        staging_path = str(cache.cache_dir / f".{item_id}.staging")
+        if self._prefetched.pop(staging_path, None) == file_hash and os.path.isdir(staging_path):
+            return staging_path
+        return None
+    
+    def _requirements_marker(self, requirements_file: Path) -> Path:
+        """Marker path for a requirements file, keyed by its content and the interpreter"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(sys.executable.encode())
+        digest.update(requirements_file.read_bytes())
+        return self._requirements_marker_dir / digest.hexdigest()
+    
+    def _mark_requirements_installed(self, marker: Path):
+        """Record that a requirements file installed cleanly"""
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except Exception as e:
+            logger.warning(f"Failed to write requirements marker {marker}: {e}")
     
     def load_task(self, task_id: str, force_reload: bool = False) -> Optional[Any]:
         """
@@ -46,6 +212,8 @@ class TaskLoader:
                 return self._loaded_tasks[task_id]
             
             # Get task metadata from database
+            if force_reload:
+                db_ops.invalidate_task_cache(task_id)
             metadata = db_ops.get_task_metadata(task_id)
             if not metadata:
                 logger.error(f"Task metadata not found: {task_id}")
@@ -62,16 +230,22 @@ class TaskLoader:
                         self._loaded_tasks[task_id] = task_class
                         return task_class
             
-            # Download task from storage
-            logger.info(f"Downloading task from storage: {task_id}")
-            if not storage_ops.download_task_package(metadata.storage_path, cache_path):
-                logger.error(f"Failed to download task package: {task_id}")
-                return None
+            # Download task from storage into a staging directory, unless
+            # load_tasks already prefetched and verified it
+            if self._take_prefetched(self.task_cache, task_id, metadata.file_hash) is None:
+                logger.info(f"Downloading task from storage: {task_id}")
+                staging_path = self.task_cache.get_staging_path(task_id)
+                if not storage_ops.download_task_package(metadata.storage_path, staging_path):
+                    logger.error(f"Failed to download task package: {task_id}")
+                    return None
+                
+                # Verify download integrity
+                if not storage_ops.verify_file_integrity(metadata.storage_path, metadata.file_hash):
+                    logger.error(f"Task package integrity check failed: {task_id}")
+                    return None
             
-            # Verify download integrity
-            if not storage_ops.verify_file_integrity(metadata.storage_path, metadata.file_hash):
-                logger.error(f"Task package integrity check failed: {task_id}")
-                return None
+            # Swap the verified package into the cache
+            cache_path = self.task_cache.commit_staged(task_id, metadata.file_hash)
             
             # Install requirements
             if not self._install_task_requirements(cache_path):
@@ -87,7 +261,10 @@ class TaskLoader:
                     return None
                 
                 self._loaded_tasks[task_id] = task_class
-                self.task_cache.mark_cached(task_id)
+                self.task_cache.mark_cached(task_id, {
+                    "file_hash": metadata.file_hash,
+                    "version": metadata.version
+                })
                 logger.info(f"Successfully loaded task: {task_id}")
                 return task_class
             
@@ -114,6 +291,8 @@ class TaskLoader:
                 return self._loaded_pipelines[pipeline_id]
             
             # Get pipeline metadata from database
+            if force_reload:
+                db_ops.invalidate_pipeline_cache(pipeline_id)
             metadata = db_ops.get_pipeline_metadata(pipeline_id)
             if not metadata:
                 logger.error(f"Pipeline metadata not found: {pipeline_id}")
@@ -130,16 +309,22 @@ class TaskLoader:
                         self._loaded_pipelines[pipeline_id] = pipeline_class
                         return pipeline_class
             
-            # Download pipeline from storage
-            logger.info(f"Downloading pipeline from storage: {pipeline_id}")
-            if not storage_ops.download_pipeline_package(metadata.storage_path, cache_path):
-                logger.error(f"Failed to download pipeline package: {pipeline_id}")
-                return None
+            # Download pipeline from storage into a staging directory, unless
+            # load_pipelines already prefetched and verified it
+            if self._take_prefetched(self.pipeline_cache, pipeline_id, metadata.file_hash) is None:
+                logger.info(f"Downloading pipeline from storage: {pipeline_id}")
+                staging_path = self.pipeline_cache.get_staging_path(pipeline_id)
+                if not storage_ops.download_pipeline_package(metadata.storage_path, staging_path):
+                    logger.error(f"Failed to download pipeline package: {pipeline_id}")
+                    return None
+                
+                # Verify download integrity
+                if not storage_ops.verify_file_integrity(metadata.storage_path, metadata.file_hash):
+                    logger.error(f"Pipeline package integrity check failed: {pipeline_id}")
+                    return None
             
-            # Verify download integrity
-            if not storage_ops.verify_file_integrity(metadata.storage_path, metadata.file_hash):
-                logger.error(f"Pipeline package integrity check failed: {pipeline_id}")
-                return None
+            # Swap the verified package into the cache
+            cache_path = self.pipeline_cache.commit_staged(pipeline_id, metadata.file_hash)
             
             # Install requirements
             if not self._install_pipeline_requirements(cache_path):
@@ -155,7 +340,10 @@ class TaskLoader:
                     return None
                 
                 self._loaded_pipelines[pipeline_id] = pipeline_class
-                self.pipeline_cache.mark_cached(pipeline_id)
+                self.pipeline_cache.mark_cached(pipeline_id, {
+                    "file_hash": metadata.file_hash,
+                    "version": metadata.version
+                })
                 logger.info(f"Successfully loaded pipeline: {pipeline_id}")
                 return pipeline_class
             
@@ -167,6 +355,11 @@ class TaskLoader:
     
     def _load_task_from_path(self, cache_path: str, metadata: Any) -> Optional[Any]:
         """Load task class from file system path"""
+        with self._import_lock:
+            return self._import_task(cache_path, metadata)
+    
+    def _import_task(self, cache_path: str, metadata: Any) -> Optional[Any]:
+        """Import task module and create its instance"""
         try:
             task_file = Path(cache_path) / "task.py"
             if not task_file.exists():
@@ -180,29 +373,20 @@ class TaskLoader:
                 with open(task_config_file, 'r') as f:
                     task_config = json.load(f)
             
-            # Add project root to sys.path to enable absolute imports
-            project_root = str(Path(__file__).parent.parent.parent)
-            if project_root not in sys.path:
-                sys.path.insert(0, project_root)
-            
-            # Dynamic import
-            spec = importlib.util.spec_from_file_location("task_module", task_file)
-            task_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(task_module)
-            
-            # Find task class (should inherit from TaskBase)
-            task_class = None
-            for attr_name in dir(task_module):
-                attr = getattr(task_module, attr_name)
-                if (isinstance(attr, type) and 
-                    hasattr(attr, 'process') and 
-                    attr.__name__ != 'TaskBase'):
-                    task_class = attr
-                    break
-            
-            if not task_class:
-                logger.error(f"No valid task class found in {task_file}")
-                return None
+            class_key = (metadata.task_id, metadata.file_hash)
+            task_class = self._class_cache.get(class_key)
+            if task_class is None:
+                # Dynamic import
+                spec = importlib.util.spec_from_file_location("task_module", task_file)
+                task_module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(task_module)
+                
+                # Find task class (should inherit from TaskBase)
+                task_class = self._find_class(task_module, 'process', 'TaskBase')
+                if not task_class:
+                    logger.error(f"No valid task class found in {task_file}")
+                    return None
+                self._class_cache[class_key] = task_class
             
             # Create instance with configuration
             instance = task_class()
@@ -218,6 +402,11 @@ class TaskLoader:
     
     def _load_pipeline_from_path(self, cache_path: str, metadata: Any) -> Optional[Any]:
         """Load pipeline class from file system path"""
+        with self._import_lock:
+            return self._import_pipeline(cache_path, metadata)
+    
+    def _import_pipeline(self, cache_path: str, metadata: Any) -> Optional[Any]:
+        """Import pipeline module and create its instance"""
         try:
             pipeline_file = Path(cache_path) / "pipeline.py"
             if not pipeline_file.exists():
@@ -231,24 +420,20 @@ class TaskLoader:
                 with open(pipeline_config_file, 'r') as f:
                     pipeline_config = json.load(f)
             
-            # Dynamic import
-            spec = importlib.util.spec_from_file_location("pipeline_module", pipeline_file)
-            pipeline_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(pipeline_module)
-            
-            # Find pipeline class (should inherit from PipelineBase)
-            pipeline_class = None
-            for attr_name in dir(pipeline_module):
-                attr = getattr(pipeline_module, attr_name)
-                if (isinstance(attr, type) and 
-                    hasattr(attr, 'execute') and 
-                    attr.__name__ != 'PipelineBase'):
-                    pipeline_class = attr
-                    break
-            
-            if not pipeline_class:
-                logger.error(f"No valid pipeline class found in {pipeline_file}")
-                return None
+            class_key = (metadata.pipeline_id, metadata.file_hash)
+            pipeline_class = self._class_cache.get(class_key)
+            if pipeline_class is None:
+                # Dynamic import
+                spec = importlib.util.spec_from_file_location("pipeline_module", pipeline_file)
+                pipeline_module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(pipeline_module)
+                
+                # Find pipeline class (should inherit from PipelineBase)
+                pipeline_class = self._find_class(pipeline_module, 'execute', 'PipelineBase')
+                if not pipeline_class:
+                    logger.error(f"No valid pipeline class found in {pipeline_file}")
+                    return None
+                self._class_cache[class_key] = pipeline_class
             
             # Create instance with configuration
             instance = pipeline_class()
@@ -262,6 +447,17 @@ class TaskLoader:
             logger.error(f"Failed to load pipeline from path {cache_path}: {e}")
             return None
     
+    @staticmethod
+    def _find_class(module: Any, method: str, base_name: str) -> Optional[type]:
+        """Find the package class exposing `method`, preferring one defined in the module itself"""
+        fallback = None
+        for attr in vars(module).values():
+            if isinstance(attr, type) and hasattr(attr, method) and attr.__name__ != base_name:
+                if attr.__module__ == module.__name__:
+                    return attr
+                fallback = fallback or attr
+        return fallback
+    
     def _install_task_requirements(self, cache_path: str) -> bool:
         """Install task requirements"""
         try:
@@ -269,15 +465,21 @@ class TaskLoader:
             if not requirements_file.exists():
                 return True  # No requirements to install
             
+            marker = self._requirements_marker(requirements_file)
+            if marker.exists():
+                return True  # Same requirements already installed
+            
             # Install using pip
-            result = subprocess.run([
-                sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-            ], capture_output=True, text=True)
+            with self._install_lock:
+                result = subprocess.run([
+                    sys.executable, *self.PIP_INSTALL, "-r", str(requirements_file)
+                ], capture_output=True, text=True)
             
             if result.returncode != 0:
                 logger.error(f"Failed to install requirements: {result.stderr}")
                 return False
             
+            self._mark_requirements_installed(marker)
             logger.info(f"Installed requirements from {requirements_file}")
             return True
             
@@ -292,15 +494,21 @@ class TaskLoader:
             if not requirements_file.exists():
                 return True  # No requirements to install
             
+            marker = self._requirements_marker(requirements_file)
+            if marker.exists():
+                return True  # Same requirements already installed
+            
             # Install using pip
-            result = subprocess.run([
-                sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-            ], capture_output=True, text=True)
+            with self._install_lock:
+                result = subprocess.run([
+                    sys.executable, *self.PIP_INSTALL, "-r", str(requirements_file)
+                ], capture_output=True, text=True)
             
             if result.returncode != 0:
                 logger.error(f"Failed to install requirements: {result.stderr}")
                 return False
             
+            self._mark_requirements_installed(marker)
             logger.info(f"Installed requirements from {requirements_file}")
             return True
             
@@ -311,7 +519,7 @@ class TaskLoader:
     def _verify_cache_integrity(self, cache_path: str, expected_hash: str) -> bool:
         """Verify cache integrity using stored hash"""
         try:
-            hash_file = Path(cache_path) / ".hash"
+            hash_file = Path(cache_path) / TaskCache.HASH_FILE
             if not hash_file.exists():
                 return False
             
@@ -357,6 +565,7 @@ class TaskLoader:
         self.pipeline_cache.clear_cache()
         self._loaded_tasks.clear()
         self._loaded_pipelines.clear()
+        self._class_cache.clear()
         logger.info("Cleared all caches")
 
 
@@ -1,7 +1,7 @@
 """
 Pipeline execution engine
 """
-import uuid
+import time
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from loguru import logger
@@ -9,7 +9,7 @@ from loguru import logger
 from core.config.manager import get_config
 from core.task_loader.loader import task_loader
 from core.database.operations import db_ops
-from core.database.models import ExecutionRecord, TaskStatus, TaskType
+from core.database.models import ExecutionRecord, TaskStatus, TaskType, new_execution_id
 
 
 class PipelineExecutor:
@@ -17,6 +17,9 @@ class PipelineExecutor:
     
     def __init__(self):
         self.config = get_config().worker
+        # Monotonic start time per running execution, so completion updates
+        # get the duration without reading the execution record back
+        self._started: Dict[str, float] = {}
     
     def execute_pipeline(self, pipeline_instance: Any, input_data: Any, execution_id: str) -> Any:
         """
@@ -31,7 +34,7 @@ class PipelineExecutor:
             Pipeline execution result
         """
         try:
-            logger.info(f"Starting pipeline execution: {pipeline_instance._pipeline_id} [{execution_id}]")
+            logger.info("Starting pipeline execution: {} [{}]", pipeline_instance._pipeline_id, execution_id)
             
             # Create execution record
             self._create_pipeline_execution_record(pipeline_instance, input_data, execution_id)
@@ -42,7 +45,7 @@ class PipelineExecutor:
             # Update execution record with success
             self._update_execution_record_success(execution_id, result)
             
-            logger.info(f"Pipeline execution completed: {pipeline_instance._pipeline_id} [{execution_id}]")
+            logger.info("Pipeline execution completed: {} [{}]", pipeline_instance._pipeline_id, execution_id)
             return result
             
         except Exception as e:
@@ -65,9 +68,9 @@ class PipelineExecutor:
         """
         try:
             # Generate task execution ID
-            task_execution_id = f"{pipeline_execution_id}_task_{task_id}_{uuid.uuid4().hex[:8]}"
+            task_execution_id = f"{pipeline_execution_id}_task_{task_id}_{new_execution_id()[:8]}"
             
-            logger.info(f"Executing task in pipeline: {task_id} [{task_execution_id}]")
+            logger.info("Executing task in pipeline: {} [{}]", task_id, task_execution_id)
             
             # Load task
             task_instance = task_loader.load_task(task_id)
@@ -83,7 +86,7 @@ class PipelineExecutor:
             # Update execution record with success
             self._update_execution_record_success(task_execution_id, result)
             
-            logger.info(f"Task execution in pipeline completed: {task_id} [{task_execution_id}]")
+            logger.info("Task execution in pipeline completed: {} [{}]", task_id, task_execution_id)
             return result
             
         except Exception as e:
@@ -108,7 +111,8 @@ class PipelineExecutor:
                 input_data={"input": input_data} if input_data is not None else {}
             )
             
-            db_ops.create_execution_record(execution_record)
+            db_ops.queue_execution_record(execution_record)
+            self._started[execution_id] = time.monotonic()
             
         except Exception as e:
             logger.error(f"Failed to create pipeline execution record: {e}")
@@ -130,7 +134,8 @@ class PipelineExecutor:
                 metadata={"pipeline_execution_id": pipeline_execution_id}
             )
             
-            db_ops.create_execution_record(execution_record)
+            db_ops.queue_execution_record(execution_record)
+            self._started[execution_id] = time.monotonic()
             
         except Exception as e:
             logger.error(f"Failed to create task execution record: {e}")
@@ -145,12 +150,11 @@ class PipelineExecutor:
             }
             
             # Calculate duration
-            execution_record = db_ops.get_execution_record(execution_id)
-            if execution_record and execution_record.started_at:
-                duration = (datetime.utcnow() - execution_record.started_at).total_seconds()
-                updates["duration"] = duration
+            started = self._started.pop(execution_id, None)
+            if started is not None:
+                updates["duration"] = time.monotonic() - started
             
-            db_ops.update_execution_record(execution_id, updates)
+            db_ops.queue_execution_update(execution_id, updates)
             
         except Exception as e:
             logger.error(f"Failed to update execution record success: {e}")
@@ -168,12 +172,11 @@ class PipelineExecutor:
             }
             
             # Calculate duration
-            execution_record = db_ops.get_execution_record(execution_id)
-            if execution_record and execution_record.started_at:
-                duration = (datetime.utcnow() - execution_record.started_at).total_seconds()
-                updates["duration"] = duration
+            started = self._started.pop(execution_id, None)
+            if started is not None:
+                updates["duration"] = time.monotonic() - started
             
-            db_ops.update_execution_record(execution_id, updates)
+            db_ops.queue_execution_update(execution_id, updates)
             
         except Exception as e:
             logger.error(f"Failed to update execution record error: {e}")
@@ -207,16 +210,16 @@ class CeleryPipelineExecutor(PipelineExecutor):
             task = task_registry.registered_tasks[task_id]
             
             # Generate task execution ID
-            task_execution_id = f"{pipeline_execution_id}_task_{task_id}_{uuid.uuid4().hex[:8]}"
+            task_execution_id = f"{pipeline_execution_id}_task_{task_id}_{new_execution_id()[:8]}"
             
-            logger.info(f"Submitting task to Celery in pipeline: {task_id} [{task_execution_id}]")
+            logger.info("Submitting task to Celery in pipeline: {} [{}]", task_id, task_execution_id)
             
             # Execute task synchronously (get result)
             result = task.apply(args=[input_data, task_execution_id])
             
             if result.successful():
                 task_result = result.result
-                logger.info(f"Celery task in pipeline completed: {task_id} [{task_execution_id}]")
+                logger.info("Celery task in pipeline completed: {} [{}]", task_id, task_execution_id)
                 return task_result.get('result') if isinstance(task_result, dict) else task_result
             else:
                 error_msg = f"Celery task failed: {result.traceback}"
@@ -252,7 +255,7 @@ class SequentialPipelineExecutor(PipelineExecutor):
         
         for i, task_id in enumerate(task_list):
             try:
-                logger.info(f"Executing sequential task {i+1}/{len(task_list)}: {task_id}")
+                logger.info("Executing sequential task {}/{}: {}", i+1, len(task_list), task_id)
                 
                 # Execute task
                 task_result = self.execute_task_in_pipeline(task_id, current_data, pipeline_execution_id)
@@ -263,7 +266,7 @@ class SequentialPipelineExecutor(PipelineExecutor):
                 # Use task result as input for next task
                 current_data = task_result
                 
-                logger.info(f"Sequential task {task_id} completed successfully")
+                logger.info("Sequential task {} completed successfully", task_id)
                 
             except Exception as e:
                 logger.error(f"Sequential task {task_id} failed: {e}")
@@ -313,7 +316,7 @@ class ParallelPipelineExecutor(PipelineExecutor):
                 try:
                     result = future.result()
                     task_results[task_id] = result
-                    logger.info(f"Parallel task {task_id} completed successfully")
+                    logger.info("Parallel task {} completed successfully", task_id)
                     
                 except Exception as e:
                     errors[task_id] = e
@@ -1,17 +1,18 @@
 """
 Pipeline Registry for managing custom pipelines
 """
-import uuid
 import time
 from typing import Any, Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from loguru import logger
 
 from .models import BasePipeline, TaskStep, PipelineResult, PipelineStage
+from .thread_pool import BoundedThreadPoolExecutor
 from .face_processing_pipeline import FaceProcessingPipeline
 from .json_loader import json_pipeline_loader
 from worker.task_registry import task_registry
 from core.config.manager import get_config
+from core.database.models import new_execution_id
 
 
 class PipelineRegistry:
@@ -19,7 +20,7 @@ class PipelineRegistry:
 
     def __init__(self):
         self.registered_pipelines: Dict[str, BasePipeline] = {}
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        self.executor = BoundedThreadPoolExecutor(max_workers=10)
 
     def register_pipeline(self, pipeline: BasePipeline) -> bool:
         """Register a pipeline"""
@@ -53,8 +54,8 @@ class PipelineRegistry:
 
     def execute_pipeline(self, pipeline_id: str, input_data: Any) -> PipelineResult:
         """Execute a pipeline with Celery workers"""
-        execution_id = str(uuid.uuid4())
-        start_time = time.time()
+        execution_id = new_execution_id()
+        start_ns = time.monotonic_ns()
 
         try:
             # Get pipeline
@@ -66,7 +67,7 @@ class PipelineRegistry:
             if not pipeline.validate_input(input_data):
                 raise ValueError("Pipeline input validation failed")
 
-            logger.info(f"Starting pipeline execution: {pipeline_id} [{execution_id}]")
+            logger.info("Starting pipeline execution: {} [{}]", pipeline_id, execution_id)
 
             # Get pipeline steps
             steps = pipeline.define_steps()
@@ -78,9 +79,9 @@ class PipelineRegistry:
             # Process final results
             final_result = pipeline.process_results(step_results)
 
-            execution_time = time.time() - start_time
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
 
-            logger.info(f"Pipeline execution completed: {pipeline_id} [{execution_id}] in {execution_time:.2f}s")
+            logger.info("Pipeline execution completed: {} [{}] in {:.2f}s", pipeline_id, execution_id, execution_time)
 
             return PipelineResult(
                 pipeline_id=pipeline_id,
@@ -91,7 +92,7 @@ class PipelineRegistry:
             )
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
             logger.error(f"Pipeline execution failed: {pipeline_id} [{execution_id}]: {e}")
 
             return PipelineResult(
@@ -164,7 +165,7 @@ class PipelineRegistry:
     def _execute_single_step(self, step: TaskStep, input_data: Any) -> Any:
         """Execute a single step using Celery if available, otherwise direct execution"""
         try:
-            logger.info(f"Executing step: {step.task_id}")
+            logger.info("Executing step: {}", step.task_id)
 
             # Try to use Celery task first
             if task_registry.is_task_registered(step.task_id):
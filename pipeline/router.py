@@ -1,14 +1,15 @@
 """
 Pipeline Router for task chaining and parallel processing
 """
-import uuid
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from dataclasses import dataclass
 from loguru import logger
 
 from core.config.manager import get_config
+from core.database.models import new_execution_id
+from pipeline.thread_pool import BoundedThreadPoolExecutor
 from worker.task_registry import task_registry
 
 
@@ -40,13 +41,13 @@ class TaskRouter:
     
     def __init__(self):
         self.active_executions: Dict[str, PipelineExecution] = {}
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        self.executor = BoundedThreadPoolExecutor(max_workers=10)
     
     def submit_task_to_worker(self, task_id: str, input_data: Any, execution_id: Optional[str] = None) -> str:
         """Submit task to specific worker queue"""
         try:
             if not execution_id:
-                execution_id = str(uuid.uuid4())
+                execution_id = new_execution_id()
             
             # Submit task to dedicated worker
             result_execution_id = task_registry.submit_task(task_id, input_data)
@@ -64,7 +65,7 @@ class TaskRouter:
     def execute_task_sync(self, task_id: str, input_data: Any) -> TaskResult:
         """Execute task synchronously and return result"""
         try:
-            execution_id = str(uuid.uuid4())
+            execution_id = new_execution_id()
             logger.info(f"Executing task {task_id} synchronously")
             
             # Load and execute task directly (bypass worker for demo)
@@ -119,7 +120,7 @@ class TaskRouter:
                     logger.error(f"Parallel task {task_id} failed: {e}")
                     results.append(TaskResult(
                         task_id=task_id,
-                        execution_id=str(uuid.uuid4()),
+                        execution_id=new_execution_id(),
                         status="failed",
                         result=None,
                         error=str(e)
@@ -257,7 +258,7 @@ class PipelineExecutor:
         """Execute the face processing pipeline demo"""
         try:
             pipeline_id = "face_processing"
-            execution_id = str(uuid.uuid4())
+            execution_id = new_execution_id()
             
             logger.info(f"Starting face processing pipeline execution: {execution_id}")
             
@@ -0,0 +1,49 @@
+"""
+Thread pool utilities for pipeline step execution
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+
+class BoundedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Thread pool whose work queue is capped
+
+    submit() from outside the pool blocks while the queue is full. A
+    submit from one of the pool's own threads (a step fanning out into
+    the same pool) never waits for a slot: with every worker blocked on
+    its own children nothing would free one. When the queue is full it
+    runs the function inline and returns a completed future instead.
+    """
+
+    def __init__(self, max_workers: int = 10, max_pending: Optional[int] = None):
+        self._local = threading.local()
+        super().__init__(max_workers=max_workers, initializer=self._mark_worker_thread)
+        self._pending = threading.BoundedSemaphore(max_pending or max_workers * 4)
+
+    def _mark_worker_thread(self):
+        self._local.in_pool = True
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        in_pool = getattr(self._local, "in_pool", False)
+        if not self._pending.acquire(blocking=not in_pool):
+            return self._run_inline(fn, *args, **kwargs)
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    @staticmethod
+    def _run_inline(fn, *args, **kwargs) -> Future:
+        """Run fn on the calling thread, returning its outcome as a finished future"""
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
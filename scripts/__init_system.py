@@ -128,58 +128,27 @@ def register_example_tasks():
         from core.database.models import TaskMetadata, TaskType
         from core.storage.operations import storage_ops
         
-        # Register face detection task
-        face_detection_path = "tasks/examples/face_detection"
-        if Path(face_detection_path).exists():
-            # Load task config
-            with open(f"{face_detection_path}/task.json", 'r') as f:
-                task_config = json.load(f)
-            
-            # Upload package
-            storage_info = storage_ops.upload_task_package(
-                task_config['task_id'], 
-                face_detection_path
-            )
-            
-            if storage_info:
-                # Create metadata
-                task_metadata = TaskMetadata(
-                    task_id=task_config['task_id'],
-                    name=task_config['name'],
-                    description=task_config['description'],
-                    version=task_config['version'],
-                    author=task_config['author'],
-                    task_type=TaskType.SINGLE,
-                    entry_point=task_config['entry_point'],
-                    requirements=task_config['requirements'],
-                    storage_path=storage_info['storage_path'],
-                    file_hash=storage_info['file_hash'],
-                    file_size=storage_info['file_size'],
-                    tags=task_config['tags'],
-                    category=task_config['category']
-                )
-                
-                if db_ops.create_task_metadata(task_metadata):
-                    console.print("[green]✓ Registered face_detection task[/green]")
-                else:
-                    console.print("[yellow]⚠ Face detection task already exists[/yellow]")
+        example_tasks = ["face_detection", "text_sentiment"]
+        pending = []
         
-        # Register text sentiment task
-        text_sentiment_path = "tasks/examples/text_sentiment"
-        if Path(text_sentiment_path).exists():
+        for task_name in example_tasks:
+            task_path = f"tasks/examples/{task_name}"
+            if not Path(task_path).exists():
+                continue
+            
             # Load task config
-            with open(f"{text_sentiment_path}/task.json", 'r') as f:
+            with open(f"{task_path}/task.json", 'r') as f:
                 task_config = json.load(f)
             
             # Upload package
             storage_info = storage_ops.upload_task_package(
                 task_config['task_id'], 
-                text_sentiment_path
+                task_path
             )
             
             if storage_info:
                 # Create metadata
-                task_metadata = TaskMetadata(
+                pending.append(TaskMetadata(
                     task_id=task_config['task_id'],
                     name=task_config['name'],
                     description=task_config['description'],
@@ -193,12 +162,15 @@ def register_example_tasks():
                     file_size=storage_info['file_size'],
                     tags=task_config['tags'],
                     category=task_config['category']
-                )
-                
-                if db_ops.create_task_metadata(task_metadata):
-                    console.print("[green]✓ Registered text_sentiment task[/green]")
-                else:
-                    console.print("[yellow]⚠ Text sentiment task already exists[/yellow]")
+                ))
+        
+        # Write all metadata in one round trip
+        registered = db_ops.create_task_metadata_bulk(pending)
+        for task_metadata in pending:
+            if task_metadata.task_id in registered:
+                console.print(f"[green]✓ Registered {task_metadata.task_id} task[/green]")
+            else:
+                console.print(f"[yellow]⚠ {task_metadata.task_id} task already exists[/yellow]")
         
         return True
         
@@ -0,0 +1,114 @@
+"""
+Tests for configuration management
+"""
+import json
+import time
+
+import pytest
+
+import core.config.manager as manager_module
+from core.config.manager import ConfigManager
+from core.config.models import TaskConfig
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConfigManager(str(tmp_path / "config.json"))
+    manager.save_delay = 0.01
+    manager.save_retry_delay = 0.01
+    manager.load_config()
+    yield manager
+    manager.flush()
+
+
+@pytest.fixture
+def saves(manager, monkeypatch):
+    """Count calls to save_config while keeping its behaviour"""
+    calls = []
+    save_config = manager.save_config
+    monkeypatch.setattr(manager, "save_config", lambda *args: calls.append(args) or save_config(*args))
+    return calls
+
+
+def saved_tasks(manager):
+    with open(manager.config_path) as f:
+        return json.load(f)["worker"]["task_configs"]
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestCoalescedSaves:
+    def test_burst_of_updates_is_written_once(self, manager, saves):
+        for i in range(20):
+            assert manager.update_task_config(f"task_{i}", TaskConfig(task_id=f"task_{i}"))
+
+        assert wait_for(lambda: len(saves) == 1)
+        time.sleep(0.05)
+        assert len(saves) == 1
+        assert "task_19" in saved_tasks(manager)
+
+    def test_flush_writes_pending_changes_now(self, manager, saves):
+        manager.save_delay = 60
+        manager.remove_task("face_detection")
+
+        assert manager.flush()
+        assert len(saves) == 1
+        assert "face_detection" not in saved_tasks(manager)
+        assert manager._save_timer is None
+
+    def test_flush_without_changes_does_not_write(self, manager, saves):
+        assert manager.flush()
+        assert saves == []
+
+    def test_batch_writes_once_on_exit(self, manager, saves):
+        with manager.batch():
+            manager.update_task_config("a", TaskConfig(task_id="a"))
+            manager.update_task_config("b", TaskConfig(task_id="b"))
+            time.sleep(0.05)
+            assert saves == []
+
+        assert len(saves) == 1
+        assert {"a", "b"} <= saved_tasks(manager).keys()
+
+
+class TestSaveFailures:
+    @pytest.fixture
+    def failing_replace(self, monkeypatch):
+        def replace(src, dst):
+            raise OSError("disk full")
+        monkeypatch.setattr(manager_module.os, "replace", replace)
+        return monkeypatch
+
+    def test_flush_reports_failure_and_keeps_changes_pending(self, manager, failing_replace):
+        manager.save_delay = 60
+        manager.update_task_config("a", TaskConfig(task_id="a"))
+
+        assert not manager.flush()
+        assert isinstance(manager.save_error, OSError)
+        assert manager._dirty
+
+        failing_replace.undo()
+        assert manager.flush()
+        assert manager.save_error is None
+        assert "a" in saved_tasks(manager)
+
+    def test_failed_write_leaves_file_and_no_temp_behind(self, manager, failing_replace):
+        before = manager.config_path.read_bytes()
+        manager.update_task_config("a", TaskConfig(task_id="a"))
+
+        assert not manager.flush()
+        assert manager.config_path.read_bytes() == before
+        assert list(manager.config_path.parent.iterdir()) == [manager.config_path]
+
+    def test_background_save_retries(self, manager, failing_replace):
+        manager.update_task_config("a", TaskConfig(task_id="a"))
+        assert wait_for(lambda: manager.save_error is not None)
+
+        failing_replace.undo()
+        assert wait_for(lambda: not manager._dirty and manager.save_error is None)
+        assert "a" in saved_tasks(manager)
@@ -0,0 +1,376 @@
+"""
+Tests for database operations
+"""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from core.config.models import MongoDBConfig
+from core.database.connection import EXECUTION_TTL_INDEX, MongoDBConnection
+from core.database.models import MAX_INLINE_OUTPUT, ExecutionRecord, TaskStatus, TaskType, WorkerStatus
+from core.database.operations import DatabaseOperations
+
+
+@pytest.fixture
+def collection():
+    return MagicMock()
+
+
+@pytest.fixture
+def ops(collection):
+    """DatabaseOperations on a mocked collection, flushed only when a test asks"""
+    ops = DatabaseOperations()
+    ops.conn = MagicMock()
+    ops.conn.get_collection.return_value = collection
+    ops._ensure_flusher = lambda: None
+    return ops
+
+
+def make_record(execution_id: str = "exec-1") -> ExecutionRecord:
+    return ExecutionRecord(
+        execution_id=execution_id,
+        celery_task_id=execution_id,
+        task_id="face_detection",
+        task_type=TaskType.SINGLE,
+        worker_id="worker_001",
+        worker_hostname="host",
+        queue="default",
+        status=TaskStatus.RUNNING,
+    )
+
+
+class TestExecutionBatching:
+    def test_updates_to_one_record_coalesce_into_one_bulk_write(self, ops, collection):
+        for i in range(10):
+            ops.queue_execution_update("exec-1", {"progress": i})
+        ops.queue_execution_update("exec-1", {"status": TaskStatus.SUCCESS})
+
+        ops.flush_execution_records()
+
+        collection.bulk_write.assert_called_once()
+        operations = collection.bulk_write.call_args.args[0]
+        assert len(operations) == 1
+        assert operations[0]._doc == {"$set": {"progress": 9, "status": TaskStatus.SUCCESS}}
+
+    def test_flush_inserts_queued_records_before_updates(self, ops, collection):
+        calls = []
+        collection.insert_many.side_effect = lambda docs, ordered: calls.append("insert") or MagicMock(inserted_ids=docs)
+        collection.bulk_write.side_effect = lambda ops_, ordered: calls.append("update")
+
+        ops.queue_execution_record(make_record())
+        ops.queue_execution_update("exec-1", {"status": TaskStatus.SUCCESS})
+
+        assert ops.flush_execution_records() == 1
+        assert calls == ["insert", "update"]
+        assert not ops._queued_records and not ops._pending_updates
+
+    def test_inserts_are_batched(self, ops, collection):
+        ops.execution_batch_size = 3
+        collection.insert_many.side_effect = lambda docs, ordered: MagicMock(inserted_ids=docs)
+        for i in range(7):
+            ops.queue_execution_record(make_record(f"exec-{i}"))
+
+        assert ops.flush_execution_records() == 7
+        assert [len(call.args[0]) for call in collection.insert_many.call_args_list] == [3, 3, 1]
+
+    def test_get_queued_record_reads_buffer_without_flushing(self, ops, collection):
+        ops.queue_execution_record(make_record())
+        ops.queue_execution_update("exec-1", {"status": TaskStatus.SUCCESS, "duration": 1.5})
+
+        record = ops.get_execution_record("exec-1")
+
+        assert record.status == TaskStatus.SUCCESS
+        assert record.duration == 1.5
+        collection.insert_many.assert_not_called()
+        collection.bulk_write.assert_not_called()
+        collection.find_one.assert_not_called()
+        # The queued record itself is untouched
+        assert ops._queued_records["exec-1"].status == TaskStatus.RUNNING
+
+    def test_get_written_record_overlays_pending_updates(self, ops, collection):
+        collection.find_one.return_value = make_record().model_dump()
+        ops.queue_execution_update("exec-1", {"status": TaskStatus.FAILED})
+
+        record = ops.get_execution_record("exec-1")
+
+        assert record.status == TaskStatus.FAILED
+        collection.bulk_write.assert_not_called()
+
+    def test_update_of_unwritten_record_is_queued_behind_pending(self, ops, collection):
+        ops.queue_execution_record(make_record())
+
+        assert ops.update_execution_record("exec-1", {"status": TaskStatus.SUCCESS})
+
+        collection.update_one.assert_not_called()
+        assert ops._pending_updates["exec-1"] == {"status": TaskStatus.SUCCESS}
+
+    def test_update_of_written_record_goes_straight_to_database(self, ops, collection):
+        collection.update_one.return_value = MagicMock(modified_count=1)
+
+        assert ops.update_execution_record("exec-1", {"status": TaskStatus.SUCCESS})
+
+        collection.update_one.assert_called_once_with(
+            {"execution_id": "exec-1"}, {"$set": {"status": TaskStatus.SUCCESS}}
+        )
+
+    def test_failed_insert_is_kept_and_retried(self, ops, collection):
+        collection.insert_many.side_effect = ConnectionError("no primary")
+        ops.queue_execution_record(make_record())
+        ops.queue_execution_update("exec-1", {"status": TaskStatus.SUCCESS})
+
+        assert ops.flush_execution_records() == 0
+        assert ops._retry_pending
+        # Still readable, and its update waits for the insert
+        assert ops.get_execution_record("exec-1").status == TaskStatus.SUCCESS
+        collection.bulk_write.assert_not_called()
+
+        collection.insert_many.side_effect = None
+        assert ops.flush_execution_records() == 1
+        assert not ops._queued_records and not ops._pending_updates
+        collection.bulk_write.assert_called_once()
+
+    def test_insert_is_dropped_after_repeated_failures(self, ops, collection):
+        collection.insert_many.side_effect = ConnectionError("no primary")
+        ops.queue_execution_record(make_record())
+
+        for _ in range(ops.execution_write_attempts):
+            ops.flush_execution_records()
+
+        assert not ops._execution_buffer and not ops._queued_records
+        assert collection.insert_many.call_count == ops.execution_write_attempts
+
+    def test_duplicate_key_counts_as_inserted(self, ops, collection):
+        collection.insert_many.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key"}], "nInserted": 1
+        })
+        ops.queue_execution_record(make_record("exec-1"))
+        ops.queue_execution_record(make_record("exec-2"))
+
+        assert ops.flush_execution_records() == 2
+        assert not ops._execution_buffer
+
+    def test_failed_update_is_merged_back_for_retry(self, ops, collection):
+        collection.bulk_write.side_effect = ConnectionError("no primary")
+        ops.queue_execution_update("exec-1", {"status": TaskStatus.SUCCESS, "progress": 1})
+
+        ops.flush_execution_records()
+        ops.queue_execution_update("exec-1", {"progress": 2})
+
+        assert ops._retry_pending
+        assert ops._pending_updates["exec-1"] == {"status": TaskStatus.SUCCESS, "progress": 2}
+
+        collection.bulk_write.side_effect = None
+        ops.flush_execution_records()
+        assert collection.bulk_write.call_args.args[0][0]._doc == {
+            "$set": {"status": TaskStatus.SUCCESS, "progress": 2}
+        }
+        assert not ops._pending_updates
+
+    def test_only_rejected_updates_are_retried(self, ops, collection):
+        collection.bulk_write.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 1, "code": 2, "errmsg": "bad value"}]
+        })
+        ops.queue_execution_update("exec-1", {"progress": 1})
+        ops.queue_execution_update("exec-2", {"progress": 1})
+
+        ops.flush_execution_records()
+
+        assert list(ops._pending_updates) == ["exec-2"]
+
+
+class TestWorkerStatusDiff:
+    @pytest.fixture
+    def registered(self, ops, collection):
+        collection.update_one.return_value = MagicMock(acknowledged=True)
+        ops.update_worker_status(WorkerStatus(
+            worker_id="worker_001", hostname="host", is_active=True,
+            version="1.0.0", memory_usage=10.0
+        ))
+        collection.update_one.reset_mock()
+        return ops
+
+    def sent_update(self, collection):
+        return collection.update_one.call_args.args[1]
+
+    def test_first_write_sets_every_field(self, ops, collection):
+        collection.update_one.return_value = MagicMock(acknowledged=True)
+        ops.update_worker_status(WorkerStatus(worker_id="worker_001", hostname="host", version="1.0.0"))
+
+        update = self.sent_update(collection)
+        assert update["$set"] == {"hostname": "host", "version": "1.0.0"}
+        assert "$setOnInsert" not in update
+
+    def test_unchanged_fields_move_to_set_on_insert(self, registered, collection):
+        registered.update_worker_status(WorkerStatus(
+            worker_id="worker_001", hostname="host", version="1.0.0", memory_usage=20.0
+        ))
+
+        update = self.sent_update(collection)
+        assert update["$set"] == {"memory_usage": 20.0}
+        assert update["$setOnInsert"] == {"hostname": "host", "version": "1.0.0"}
+
+    def test_liveness_is_always_set(self, registered, collection):
+        registered.update_worker_status(WorkerStatus(worker_id="worker_001", hostname="host", is_active=True))
+
+        assert self.sent_update(collection)["$set"] == {"is_active": True}
+
+    def test_heartbeat_stamped_by_server(self, registered, collection):
+        registered.update_worker_status(WorkerStatus(
+            worker_id="worker_001", hostname="host", last_heartbeat=datetime.utcnow()
+        ))
+
+        update = self.sent_update(collection)
+        assert update["$currentDate"] == {"last_heartbeat": True}
+        assert "last_heartbeat" not in update.get("$set", {})
+
+    def test_unacknowledged_write_does_not_move_baseline(self, registered, collection):
+        registered.update_worker_status(
+            WorkerStatus(worker_id="worker_001", hostname="host", memory_usage=30.0), acknowledged=False
+        )
+        # The w=0 write may have been lost, so the same value is sent again
+        registered.update_worker_status(
+            WorkerStatus(worker_id="worker_001", hostname="host", memory_usage=30.0), acknowledged=False
+        )
+
+        assert self.sent_update(collection)["$set"] == {"memory_usage": 30.0}
+
+    def test_task_count_adjustment_forces_resend(self, registered, collection):
+        collection.update_one.return_value = MagicMock(acknowledged=True)
+        registered.update_worker_status(WorkerStatus(worker_id="worker_001", hostname="host", current_task_count=0))
+        collection.find_one_and_update.return_value = None
+
+        registered.adjust_worker_task_count("worker_001", 1)
+        registered.update_worker_status(WorkerStatus(worker_id="worker_001", hostname="host", current_task_count=0))
+
+        assert self.sent_update(collection)["$set"] == {"current_task_count": 0}
+
+
+class TestExecutionRetention:
+    @pytest.fixture
+    def connection(self, collection):
+        connection = MongoDBConnection(MongoDBConfig())
+        connection._database = MagicMock()
+        connection._database.__getitem__.return_value = collection
+        collection.index_information.return_value = {}
+        return connection
+
+    def test_retention_is_opt_in(self):
+        assert MongoDBConfig().execution_retention_days is None
+
+    def test_creates_ttl_index(self, connection, collection):
+        assert connection.set_execution_retention(7)
+
+        collection.create_index.assert_called_once_with(
+            [("created_at", 1)], name=EXECUTION_TTL_INDEX, expireAfterSeconds=7 * 86400
+        )
+
+    def test_disabled_creates_plain_index(self, connection, collection):
+        assert connection.set_execution_retention(None)
+
+        collection.create_index.assert_called_once_with([("created_at", 1)], name=EXECUTION_TTL_INDEX)
+
+    def test_retunes_existing_ttl_in_place(self, connection, collection):
+        collection.index_information.return_value = {EXECUTION_TTL_INDEX: {"expireAfterSeconds": 86400}}
+
+        assert connection.set_execution_retention(30)
+
+        connection._database.command.assert_called_once_with("collMod", "execution_records", index={
+            "name": EXECUTION_TTL_INDEX, "expireAfterSeconds": 30 * 86400
+        })
+        collection.drop_index.assert_not_called()
+        collection.create_index.assert_not_called()
+
+    def test_unchanged_retention_is_a_no_op(self, connection, collection):
+        collection.index_information.return_value = {EXECUTION_TTL_INDEX: {"expireAfterSeconds": 86400}}
+
+        assert connection.set_execution_retention(1)
+
+        connection._database.command.assert_not_called()
+        collection.create_index.assert_not_called()
+
+    def test_disabling_replaces_ttl_with_plain_index(self, connection, collection):
+        collection.index_information.return_value = {EXECUTION_TTL_INDEX: {"expireAfterSeconds": 86400}}
+
+        assert connection.set_execution_retention(None)
+
+        collection.drop_index.assert_called_once_with(EXECUTION_TTL_INDEX)
+        collection.create_index.assert_called_once_with([("created_at", 1)], name=EXECUTION_TTL_INDEX)
+
+    def test_cleanup_is_a_one_shot_delete(self, ops, collection):
+        collection.delete_many.return_value = MagicMock(deleted_count=2)
+
+        assert ops.cleanup_old_records(7)
+
+        threshold = collection.delete_many.call_args.args[0]["created_at"]["$lt"]
+        assert abs((datetime.utcnow() - threshold).days - 7) <= 1
+        ops.conn.set_execution_retention.assert_not_called()
+
+
+class TestOutputSpill:
+    @pytest.fixture
+    def storage(self, monkeypatch):
+        import core.storage.operations as storage_module
+        storage = MagicMock()
+        storage.upload_bytes.return_value = True
+        monkeypatch.setattr(storage_module, "storage_ops", storage)
+        return storage
+
+    def test_small_output_is_kept_inline_without_encoding(self, ops, storage, monkeypatch):
+        import core.database.operations as operations_module
+        encode = MagicMock()
+        monkeypatch.setattr(operations_module.bson, "encode", encode)
+        output = {"label": "cat", "score": 0.9}
+
+        assert ops._spill_output("exec-1", output) is output
+        encode.assert_not_called()
+        storage.upload_bytes.assert_not_called()
+
+    def test_output_under_limit_keeps_original_value(self, ops, storage):
+        output = {"boxes": [[1, 2, 3, 4]] * 100, "at": datetime(2024, 1, 1)}
+
+        assert ops._spill_output("exec-1", output) is output
+        storage.upload_bytes.assert_not_called()
+
+    def test_large_output_is_spilled_and_read_back(self, ops, storage):
+        output = {"embedding": [0.5] * 50000, "at": datetime(2024, 1, 1)}
+
+        stored = ops._spill_output("exec-1", output)
+
+        assert stored["_ref"] == "executions/exec-1/output.bson"
+        data = storage.upload_bytes.call_args.args[1]
+        assert stored["size"] == len(data)
+
+        ops.queue_execution_record(make_record())
+        ops.queue_execution_update("exec-1", {"output_data": stored})
+        storage.download_bytes.return_value = data
+        assert ops.get_execution_output("exec-1") == output
+
+    def test_record_rejects_oversized_inline_output(self):
+        with pytest.raises(ValueError):
+            ExecutionRecord(**{**make_record().model_dump(), "output_data": {"blob": "x" * (MAX_INLINE_OUTPUT + 1)}})
+
+
+class TestCachedReads:
+    def test_task_metadata_cache_returns_copies(self, ops, collection):
+        collection.find_one.return_value = {
+            "task_id": "face_detection", "name": "Face detection", "entry_point": "task.FaceTask",
+            "storage_path": "tasks/face_detection.zip", "file_hash": "abc", "file_size": 1,
+            "tags": ["vision"]
+        }
+
+        first = ops.get_task_metadata("face_detection")
+        first.tags.append("mutated")
+        second = ops.get_task_metadata("face_detection")
+
+        collection.find_one.assert_called_once()
+        assert second.tags == ["vision"]
+
+    def test_statistics_cache_returns_copies(self, ops, collection):
+        collection.aggregate.return_value = iter([{"_id": TaskStatus.SUCCESS.value, "count": 2}])
+
+        ops.get_worker_statistics("worker_001")["successful"] = 99
+
+        assert ops.get_worker_statistics("worker_001")["successful"] == 2
+        collection.aggregate.assert_called_once()
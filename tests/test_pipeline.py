@@ -0,0 +1,51 @@
+"""
+Tests for pipeline step execution
+"""
+import threading
+
+import pytest
+
+from pipeline.thread_pool import BoundedThreadPoolExecutor
+
+
+@pytest.fixture
+def pool():
+    pool = BoundedThreadPoolExecutor(max_workers=2, max_pending=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class TestBoundedThreadPoolExecutor:
+    def test_outside_submit_blocks_while_full(self, pool):
+        release = threading.Event()
+        for _ in range(2):
+            pool.submit(release.wait)
+
+        submitted = threading.Event()
+        threading.Thread(target=lambda: pool.submit(len, "") and submitted.set(), daemon=True).start()
+
+        assert not submitted.wait(0.1)
+        release.set()
+        assert submitted.wait(2)
+
+    def test_nested_submit_into_full_pool_runs_inline(self, pool):
+        def parent(i):
+            # Every worker fans out into the same pool, which is already full
+            children = [pool.submit(lambda n=n: (i, n, threading.current_thread().name)) for n in range(3)]
+            return [child.result(timeout=2) for child in children]
+
+        parents = [pool.submit(parent, i) for i in range(2)]
+
+        results = [future.result(timeout=5) for future in parents]
+        assert [[(i, n) for i, n, _ in children] for children in results] == [
+            [(0, 0), (0, 1), (0, 2)], [(1, 0), (1, 1), (1, 2)]
+        ]
+
+    def test_inline_failure_is_reported_through_the_future(self, pool):
+        def parent():
+            def child():
+                raise ValueError("bad step")
+            futures = [pool.submit(child) for _ in range(3)]
+            return [type(future.exception(timeout=2)) for future in futures]
+
+        assert pool.submit(parent).result(timeout=5) == [ValueError] * 3
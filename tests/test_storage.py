@@ -0,0 +1,187 @@
+"""
+Tests for storage operations
+"""
+import zipfile
+import zlib
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+from minio.error import S3Error
+
+import core.storage.operations as operations_module
+from core.storage.operations import StorageOperations
+
+
+@pytest.fixture
+def client():
+    return MagicMock()
+
+
+@pytest.fixture
+def storage(client):
+    storage = StorageOperations()
+    storage.conn = MagicMock()
+    storage.conn.client = client
+    storage.bucket = "tasks"
+    return storage
+
+
+class TestIterObject:
+    def test_small_object_is_streamed_in_one_get(self, storage, client):
+        client.stat_object.return_value = MagicMock(size=10, etag="v1")
+        client.get_object.return_value.stream.return_value = iter([b"hello", b"world"])
+
+        assert b"".join(storage._iter_object("a.zip")) == b"helloworld"
+        client.get_object.assert_called_once_with("tasks", "a.zip")
+
+    def test_sequential_read_skips_the_stat(self, storage, client):
+        client.get_object.return_value.stream.return_value = iter([b"payload"])
+
+        assert b"".join(storage._iter_object("out.bson", parallel=False)) == b"payload"
+        client.stat_object.assert_not_called()
+
+    def test_large_object_is_fetched_in_ranges_pinned_to_etag(self, storage, client):
+        storage.parallel_download_threshold = 8
+        storage.transfer_part_size = 4
+        data = b"0123456789"
+        client.stat_object.return_value = MagicMock(size=len(data), etag="v1")
+
+        def get_object(bucket, name, offset=0, length=0, request_headers=None):
+            assert request_headers == {"If-Match": '"v1"'}
+            response = MagicMock()
+            response.read.return_value = data[offset:offset + length]
+            return response
+        client.get_object.side_effect = get_object
+
+        assert b"".join(storage._iter_object("a.zip")) == data
+        assert [(call.kwargs["offset"], call.kwargs["length"]) for call in client.get_object.call_args_list] == [
+            (0, 4), (4, 4), (8, 2)
+        ]
+
+    def test_download_starts_over_when_object_changes(self, storage, client):
+        storage.parallel_download_threshold = 8
+        storage.transfer_part_size = 4
+        versions = {"v1": b"aaaaaaaaaa", "v2": b"bbbbbbbbbb"}
+        client.stat_object.side_effect = [MagicMock(size=10, etag="v1"), MagicMock(size=10, etag="v2")]
+
+        def get_object(bucket, name, offset=0, length=0, request_headers=None):
+            etag = request_headers["If-Match"].strip('"')
+            if etag == "v1" and offset > 0:
+                # Replaced by v2 after the first part was read
+                raise S3Error(MagicMock(), "PreconditionFailed", "changed", name, "", "")
+            response = MagicMock()
+            response.read.return_value = versions[etag][offset:offset + length]
+            return response
+        client.get_object.side_effect = get_object
+
+        buffer = BytesIO()
+        storage._download_to("a.zip", buffer)
+
+        assert buffer.getvalue() == versions["v2"]
+
+
+class TestZipFolder:
+    @pytest.fixture
+    def folder(self, tmp_path):
+        (tmp_path / "task.py").write_text("print('hello')\n" * 100)
+        (tmp_path / "weights.onnx").write_bytes(b"\x00" * 1000)
+        return tmp_path
+
+    def test_archive_round_trips(self, storage, folder):
+        target = BytesIO()
+        sha256, size = storage._zip_folder(folder, target)
+
+        assert size == len(target.getvalue())
+        with zipfile.ZipFile(target) as zipf:
+            assert zipf.read("task.py") == (folder / "task.py").read_bytes()
+            assert zipf.getinfo("task.py").compress_type == zipfile.ZIP_DEFLATED
+            assert zipf.getinfo("weights.onnx").compress_type == zipfile.ZIP_STORED
+
+    def test_zlib_ng_is_used_without_patching_zipfile(self, storage, folder, monkeypatch):
+        levels = []
+        fake = MagicMock(Z_DEFAULT_COMPRESSION=zlib.Z_DEFAULT_COMPRESSION, DEFLATED=zlib.DEFLATED)
+        fake.compressobj.side_effect = lambda level, *args: levels.append(level) or zlib.compressobj(level, *args)
+        monkeypatch.setattr(operations_module, "zlib_ng", fake)
+        monkeypatch.setattr(operations_module, "_USE_ZLIB_NG", True)
+
+        target = BytesIO()
+        storage._zip_folder(folder, target)
+
+        assert levels == [storage.package_compress_level]
+        assert zipfile.zlib is zlib
+        with zipfile.ZipFile(target) as zipf:
+            assert zipf.testzip() is None
+
+    def test_write_hook_matches_this_python(self):
+        assert operations_module._zipfile_write_hook_supported()
+
+    def test_unexpected_zipfile_internals_fall_back_to_zlib(self, storage, folder, monkeypatch):
+        monkeypatch.setattr(zipfile.ZipFile, "_open_to_write", lambda self, zinfo, force_zip64=False, extra=None: None)
+        assert not operations_module._zipfile_write_hook_supported()
+        monkeypatch.undo()
+
+        fake = MagicMock()
+        monkeypatch.setattr(operations_module, "zlib_ng", fake)
+        monkeypatch.setattr(operations_module, "_USE_ZLIB_NG", False)
+
+        target = BytesIO()
+        storage._zip_folder(folder, target)
+
+        fake.compressobj.assert_not_called()
+        with zipfile.ZipFile(target) as zipf:
+            assert zipf.testzip() is None
+
+
+
+class TestCleanupOldPackages:
+    @pytest.fixture
+    def deleted(self, client):
+        """Stale objects in a bucket holding packages and spilled outputs; collects deleted names"""
+        from datetime import datetime, timezone
+        old = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        names = ["tasks/a.zip", "tasks/notes.txt", "pipelines/p.zip", "executions/e1/output.bson"]
+        client.list_objects.side_effect = lambda bucket, prefix="", recursive=False: [
+            MagicMock(object_name=name, last_modified=old) for name in names if name.startswith(prefix)
+        ]
+        deleted = []
+        # remove_objects returns the delete errors; none here
+        client.remove_objects.side_effect = lambda bucket, objects: [
+            obj for obj in objects if deleted.append(obj.name)
+        ]
+        return deleted
+
+    def test_spilled_outputs_are_kept(self, storage, deleted):
+        assert storage.cleanup_old_packages(days=1) == 2
+        assert deleted == ["tasks/a.zip", "pipelines/p.zip"]
+
+    def test_only_zip_packages_are_deleted(self, storage, deleted):
+        storage.cleanup_old_packages(days=1)
+        assert "tasks/notes.txt" not in deleted
+
+
+class TestUploadPackage:
+    @pytest.fixture
+    def folder(self, tmp_path):
+        (tmp_path / "task.py").write_text("print('hello')\n")
+        return tmp_path
+
+    def test_unchanged_package_is_not_uploaded(self, storage, client, folder):
+        file_hash, _ = storage._zip_folder(folder, BytesIO())
+        client.stat_object.return_value = MagicMock(metadata={"x-amz-meta-sha256": file_hash})
+
+        storage._upload_package(folder, "tasks/t/t.zip")
+
+        client.put_object.assert_not_called()
+
+    def test_package_replaced_elsewhere_is_uploaded_again(self, storage, client, folder):
+        client.stat_object.return_value = MagicMock(metadata={})
+        storage._upload_package(folder, "tasks/t/t.zip")
+        file_hash = client.put_object.call_args.kwargs["metadata"]["sha256"]
+
+        # Another process overwrote the object since this one uploaded it
+        client.stat_object.return_value = MagicMock(metadata={"x-amz-meta-sha256": "other"})
+        storage._upload_package(folder, "tasks/t/t.zip")
+
+        assert client.put_object.call_count == 2
+        assert client.put_object.call_args.kwargs["metadata"] == {"sha256": file_hash}
@@ -0,0 +1,175 @@
+"""
+Tests for the local task cache
+"""
+import json
+import os
+import time
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import core.task_loader.cache as cache_module
+import core.task_loader.loader as loader_module
+from core.task_loader.cache import TaskCache
+from core.task_loader.loader import TaskLoader
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TaskCache(str(tmp_path / "cache"))
+    cache.save_delay = 0.01
+    yield cache
+    cache.flush()
+
+
+@pytest.fixture
+def replaces(monkeypatch):
+    """Count index renames while keeping their behaviour"""
+    calls = []
+    replace = os.replace
+    monkeypatch.setattr(cache_module.os, "replace", lambda src, dst: calls.append(dst) or replace(src, dst))
+    return calls
+
+
+def make_item(cache, item_id):
+    path = cache.cache_dir / item_id
+    path.mkdir()
+    (path / "task.py").write_text("x" * 10)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestCacheIndexWrites:
+    def test_burst_of_changes_is_written_once(self, cache, replaces):
+        for i in range(10):
+            make_item(cache, f"task_{i}")
+            cache.mark_cached(f"task_{i}", {"file_hash": str(i)})
+
+        assert wait_for(lambda: not cache._dirty)
+        time.sleep(0.05)
+        assert replaces == [cache.cache_index_file]
+
+    def test_flushed_index_is_reloaded(self, cache):
+        make_item(cache, "face_detection")
+        cache.mark_cached("face_detection", {"file_hash": "abc"})
+
+        assert cache.flush()
+
+        reloaded = TaskCache(str(cache.cache_dir))
+        assert reloaded.get_cache_info("face_detection")["file_hash"] == "abc"
+        assert reloaded.get_cache_info("face_detection")["size_bytes"] == 10
+
+    def test_json_fallback_without_orjson(self, cache, monkeypatch):
+        monkeypatch.setattr(cache_module, "orjson", None)
+        make_item(cache, "face_detection")
+        cache.mark_cached("face_detection")
+
+        assert cache.flush()
+        with open(cache.cache_index_file) as f:
+            assert "face_detection" in json.load(f)
+
+    def test_failed_write_keeps_old_index_and_no_temp(self, cache, monkeypatch):
+        make_item(cache, "a")
+        cache.mark_cached("a")
+        assert cache.flush()
+        before = cache.cache_index_file.read_bytes()
+
+        def replace(src, dst):
+            raise OSError("disk full")
+        monkeypatch.setattr(cache_module.os, "replace", replace)
+        make_item(cache, "b")
+        cache.mark_cached("b")
+
+        assert not cache.flush()
+        assert cache._dirty
+        assert cache.cache_index_file.read_bytes() == before
+        assert not [p for p in cache.cache_dir.iterdir() if p.name.endswith(".tmp")]
+
+        monkeypatch.undo()
+        assert cache.flush()
+        assert "b" in TaskCache(str(cache.cache_dir)).get_cached_items()
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """TaskLoader over a temp cache, with metadata and storage mocked out"""
+    db_ops = MagicMock()
+    db_ops.get_task_metadata.return_value = MagicMock(
+        storage_path="tasks/face_detection.zip", file_hash="abc", version="1.0.0"
+    )
+    storage_ops = MagicMock()
+
+    def download(storage_path, staging_path):
+        os.makedirs(staging_path)
+        with open(os.path.join(staging_path, "task.py"), "w") as f:
+            f.write("class Task: pass\n")
+        with open(os.path.join(staging_path, "requirements.txt"), "w") as f:
+            f.write("example-package==1.0\n")
+        return True
+    storage_ops.download_task_package.side_effect = download
+    storage_ops.verify_file_integrity.return_value = True
+    monkeypatch.setattr(loader_module, "db_ops", db_ops)
+    monkeypatch.setattr(loader_module, "storage_ops", storage_ops)
+
+    loader = TaskLoader()
+    loader.task_cache = TaskCache(str(tmp_path / "tasks"))
+    loader._requirements_marker_dir = tmp_path / "markers"
+    loader._load_task_from_path = MagicMock(return_value=MagicMock())
+    loader.validator = MagicMock()
+    loader.pip_runs = []
+
+    def run(args, **kwargs):
+        loader.pip_runs.append(args)
+        return MagicMock(returncode=0, stderr="")
+    monkeypatch.setattr(loader_module.subprocess, "run", run)
+    yield loader
+    loader.task_cache.flush()
+
+
+class TestPrefetch:
+    def test_prefetched_package_is_downloaded_once_and_cached(self, loader):
+        assert "face_detection" in loader.load_tasks(["face_detection"])
+
+        loader_module.storage_ops.download_task_package.assert_called_once()
+        assert loader.task_cache.is_cached("face_detection")
+        loader.validator.validate_task.assert_called_once()
+
+    def test_invalid_prefetched_package_is_not_cached(self, loader):
+        loader.validator.validate_task.return_value = False
+
+        assert loader.load_tasks(["face_detection"]) == {}
+        assert not loader.task_cache.is_cached("face_detection")
+
+        # Still rejected on the next load instead of served from the cache
+        assert loader.load_task("face_detection") is None
+        assert loader.validator.validate_task.call_count == 2
+
+    def test_failed_batch_install_falls_back_per_package(self, loader, monkeypatch):
+        runs = []
+
+        def run(args, **kwargs):
+            runs.append(args)
+            # The batch fails; the per-package retry succeeds
+            return MagicMock(returncode=1 if len(runs) == 1 else 0, stderr="conflict")
+        monkeypatch.setattr(loader_module.subprocess, "run", run)
+
+        assert "face_detection" in loader.load_tasks(["face_detection"])
+        assert len(runs) == 2
+
+    def test_package_whose_requirements_never_install_is_not_loaded(self, loader, monkeypatch):
+        monkeypatch.setattr(loader_module.subprocess, "run", lambda args, **kwargs: MagicMock(returncode=1, stderr="conflict"))
+
+        assert loader.load_tasks(["face_detection"]) == {}
+        loader._load_task_from_path.assert_not_called()
+        assert not loader.task_cache.is_cached("face_detection")
+
+    def test_successful_batch_is_not_repeated_per_package(self, loader):
+        loader.load_tasks(["face_detection"])
+
+        assert len(loader.pip_runs) == 1
@@ -0,0 +1,177 @@
+"""
+Tests for worker lifecycle management
+"""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import core.database.operations as operations_module
+import worker.celery_app as celery_app_module
+import worker.task_registry as task_registry_module
+import worker.worker_manager as worker_manager_module
+from core.database.models import PipelineMetadata
+from worker.task_registry import TaskRegistry
+from worker.worker_manager import WorkerManager
+
+
+@pytest.fixture
+def db_ops(monkeypatch):
+    db_ops = MagicMock()
+    db_ops.update_worker_status.return_value = True
+    monkeypatch.setattr(worker_manager_module, "db_ops", db_ops)
+    return db_ops
+
+
+@pytest.fixture
+def manager(db_ops):
+    manager = WorkerManager()
+    manager._get_worker_statistics = lambda: {
+        "current_tasks": 3, "total_executed": 10, "successful": 9, "failed": 1
+    }
+    manager._get_memory_usage = lambda: 100.0
+    manager._get_cpu_usage = lambda: 5.0
+    yield manager
+    manager._stop_heartbeat()
+
+
+class TestHeartbeat:
+    def test_not_due_right_after_a_write(self, manager):
+        manager._last_heartbeat = time.monotonic()
+        assert not manager._heartbeat_due()
+
+    def test_due_once_max_age_passes(self, manager):
+        manager._last_heartbeat = time.monotonic() - manager.heartbeat_max_age
+        assert manager._heartbeat_due()
+
+    def test_max_age_leaves_room_for_lost_writes(self, manager):
+        assert manager.heartbeat_max_age * 4 <= manager.heartbeat_ttl
+
+    def test_state_change_makes_heartbeat_due(self, manager):
+        manager._last_heartbeat = time.monotonic()
+        manager.notify_state_change()
+        assert manager._heartbeat_due()
+        assert manager._wake_event.is_set()
+
+    def test_send_clears_dirty_and_records_time(self, manager, db_ops):
+        manager.notify_state_change()
+        manager._send_heartbeat()
+
+        assert not manager._heartbeat_dirty
+        assert not manager._heartbeat_due()
+        status = db_ops.update_worker_status.call_args.args[0]
+        assert db_ops.update_worker_status.call_args.kwargs == {"acknowledged": False}
+        assert status.is_active
+        assert status.total_tasks_executed == 10
+
+    def test_heartbeat_does_not_write_task_count(self, manager, db_ops):
+        manager._send_heartbeat()
+
+        status = db_ops.update_worker_status.call_args.args[0]
+        assert "current_task_count" not in status.model_fields_set
+
+    def test_failed_send_stays_due(self, manager, db_ops):
+        db_ops.update_worker_status.return_value = False
+        manager._send_heartbeat()
+        assert manager._heartbeat_due()
+
+    def test_loop_writes_promptly_on_state_change(self, manager, db_ops):
+        manager.heartbeat_interval = 60
+        manager._last_heartbeat = time.monotonic()
+        manager._start_heartbeat()
+        time.sleep(0.05)
+        db_ops.update_worker_status.assert_not_called()
+
+        manager.notify_state_change()
+        deadline = time.monotonic() + 2
+        while not db_ops.update_worker_status.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        db_ops.update_worker_status.assert_called_once()
+
+    def test_task_count_change_wakes_heartbeat(self, manager, db_ops):
+        db_ops.adjust_worker_task_count.return_value = MagicMock()
+        manager._last_heartbeat = time.monotonic()
+
+        manager.update_task_count(1)
+
+        db_ops.adjust_worker_task_count.assert_called_once_with(manager.worker_id, 1)
+        assert manager._heartbeat_due()
+
+
+@pytest.fixture
+def registry_db(monkeypatch):
+    db_ops = MagicMock()
+    db_ops.get_pipeline_metadata.return_value = PipelineMetadata(
+        pipeline_id="image_pipeline", name="Image pipeline", tasks=["face_detection", "ocr"],
+        storage_path="pipelines/image_pipeline.zip", file_hash="abc", file_size=1
+    )
+    monkeypatch.setattr(task_registry_module, "db_ops", db_ops)
+    return db_ops
+
+
+@pytest.fixture
+def registry(registry_db):
+    registry = TaskRegistry()
+    registry.registered_pipelines["image_pipeline"] = MagicMock()
+    return registry
+
+
+class TestRegistryInfoCache:
+    def test_pipeline_info_is_cached(self, registry, registry_db):
+        registry.get_pipeline_info("image_pipeline")
+        registry.get_pipeline_info("image_pipeline")
+
+        registry_db.get_pipeline_metadata.assert_called_once()
+
+    def test_pipeline_info_returns_copies(self, registry):
+        info = registry.get_pipeline_info("image_pipeline")
+        info["name"] = "mutated"
+        info["tasks"].append("mutated")
+
+        info = registry.get_pipeline_info("image_pipeline")
+        assert info["name"] == "Image pipeline"
+        assert info["tasks"] == ["face_detection", "ocr"]
+
+    def test_pipeline_info_expires_after_ttl(self, registry, registry_db):
+        registry.get_pipeline_info("image_pipeline")
+        metadata = registry_db.get_pipeline_metadata.return_value
+        registry_db.get_pipeline_metadata.return_value = metadata.model_copy(update={"name": "Renamed"})
+        assert registry.get_pipeline_info("image_pipeline")["name"] == "Image pipeline"
+
+        _, info = registry._pipeline_info_cache["image_pipeline"]
+        registry._pipeline_info_cache["image_pipeline"] = (time.monotonic() - 1, info)
+
+        assert registry.get_pipeline_info("image_pipeline")["name"] == "Renamed"
+
+
+class TestTaskCount:
+    @pytest.fixture
+    def running(self, manager, db_ops, monkeypatch):
+        """Running count as the worker status document would hold it"""
+        count = {"value": 0}
+
+        def adjust(worker_id, increment):
+            count["value"] = max(0, count["value"] + increment)
+            return MagicMock()
+        db_ops.adjust_worker_task_count.side_effect = adjust
+        monkeypatch.setattr(worker_manager_module, "worker_manager", manager)
+        monkeypatch.setattr(operations_module, "db_ops", MagicMock())
+        return count
+
+    def test_count_rises_while_task_runs(self, running):
+        task = MagicMock()
+        task.name = "face_detection"
+
+        celery_app_module.task_prerun_handler(task_id="t1", task=task, args=(), kwargs={})
+        assert running["value"] == 1
+
+        celery_app_module.task_postrun_handler(task_id="t1", task=task, state="SUCCESS", retval={})
+        assert running["value"] == 0
+
+    def test_postrun_without_prerun_does_not_decrement(self, running):
+        running["value"] = 1
+        task = MagicMock()
+        task.name = "face_detection"
+
+        celery_app_module.task_postrun_handler(task_id="unknown", task=task, state="SUCCESS", retval={})
+        assert running["value"] == 1
@@ -229,7 +229,7 @@ def list():
 def info(task_id):
     """Show detailed task information"""
     try:
-        task_metadata = db_ops.get_task_metadata(task_id)
+        task_metadata, stats = db_ops.get_task_metadata_with_statistics(task_id)
         
         if not task_metadata:
             console.print(f"[red]Task not found: {task_id}[/red]")
@@ -259,8 +259,7 @@ def info(task_id):
         panel = Panel(info_text.strip(), title=f"Task Information: {task_id}", border_style="blue")
         console.print(panel)
         
-        # Get execution statistics
-        stats = db_ops.get_task_statistics(task_id)
+        # Show execution statistics
         if stats:
             stats_text = f"""
 [bold green]Total Executions:[/bold green] {stats.get('total_executions', 0)}
@@ -313,6 +312,29 @@ def delete(task_id, confirm):
         console.print(f"[red]Failed to delete task: {e}[/red]")
 
 
+@cli.command('download-url')
+@click.argument('task_id')
+@click.option('--expires', '-e', default=300, help='URL lifetime in seconds')
+def download_url(task_id, expires):
+    """Print a pre-signed download URL for a task package"""
+    try:
+        task_metadata = db_ops.get_task_metadata(task_id)
+        
+        if not task_metadata:
+            console.print(f"[red]Task not found: {task_id}[/red]")
+            return
+        
+        url = storage_ops.get_package_url(task_metadata.storage_path, expires=expires)
+        if not url:
+            console.print("[red]Failed to create download URL[/red]")
+            return
+        
+        click.echo(url)
+        
+    except Exception as e:
+        console.print(f"[red]Failed to get download URL: {e}[/red]")
+
+
 @cli.command()
 @click.argument('task_id')
 @click.option('--enable/--disable', default=True, help='Enable or disable task')
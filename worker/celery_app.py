@@ -1,8 +1,13 @@
 """
 Celery application configuration and setup
 """
+import time
+from typing import Dict
 from celery import Celery
-from celery.signals import worker_ready, worker_shutdown, task_prerun, task_postrun, task_failure
+from celery.signals import (
+    worker_ready, worker_shutdown, worker_process_shutdown,
+    task_prerun, task_postrun, task_failure
+)
 from kombu import Queue, Exchange
 from loguru import logger
 
@@ -11,12 +16,42 @@ from core.database.connection import init_database
 from core.storage.connection import init_storage
 
 
+def register_orjson_serializer() -> bool:
+    """Register the 'orjson' message serializer with kombu if orjson is installed"""
+    try:
+        import orjson
+    except ImportError:
+        return False
+    
+    from kombu.serialization import register
+    
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+    register(
+        'orjson',
+        lambda obj: orjson.dumps(obj, option=options),
+        orjson.loads,
+        content_type='application/x-orjson',
+        content_encoding='binary'
+    )
+    return True
+
+
 def create_celery_app() -> Celery:
     """Create and configure Celery application"""
     
     config = get_config()
     celery_config = config.worker.celery
     
+    # Fall back to stdlib JSON where orjson was configured but isn't installed
+    task_serializer = celery_config.task_serializer
+    result_serializer = celery_config.result_serializer
+    accept_content = list(celery_config.accept_content)
+    if not register_orjson_serializer() and 'orjson' in (task_serializer, result_serializer):
+        logger.warning("orjson is not installed, using json serializer")
+        task_serializer = 'json' if task_serializer == 'orjson' else task_serializer
+        result_serializer = 'json' if result_serializer == 'orjson' else result_serializer
+        accept_content = ['json' if content == 'orjson' else content for content in accept_content]
+    
     # Create Celery app
     app = Celery('ai_worker')
     
@@ -24,9 +59,9 @@ def create_celery_app() -> Celery:
     app.conf.update(
         broker_url=celery_config.broker_url,
         result_backend=celery_config.result_backend,
-        task_serializer=celery_config.task_serializer,
-        accept_content=celery_config.accept_content,
-        result_serializer=celery_config.result_serializer,
+        task_serializer=task_serializer,
+        accept_content=accept_content,
+        result_serializer=result_serializer,
         timezone=celery_config.timezone,
         enable_utc=celery_config.enable_utc,
         worker_prefetch_multiplier=celery_config.worker_prefetch_multiplier,
@@ -111,16 +146,41 @@ def worker_shutdown_handler(sender=None, **kwargs):
     # Unregister worker
     from .worker_manager import worker_manager
     worker_manager.unregister_worker()
+    
+    # Write any buffered execution records
+    from core.database.operations import db_ops
+    db_ops.flush_execution_records()
+    
+    # Drain queued log records before the process exits
+    logger.complete()
+
+
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(pid=None, exitcode=None, **kwargs):
+    """Handle pool process shutdown signal"""
+    # Pool children exit without running atexit hooks
+    from core.database.operations import db_ops
+    db_ops.flush_execution_records()
+
+
+# Monotonic start time per running task in this process, so completion
+# handlers get the duration without reading the execution record back
+_task_started: Dict[str, float] = {}
 
 
 @task_prerun.connect
 def task_prerun_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, **kw):
     """Handle task prerun signal"""
     from datetime import datetime
-    from ..core.database.operations import db_ops
-    from ..core.database.models import ExecutionRecord, TaskStatus
+    from core.database.operations import db_ops
+    from core.database.models import ExecutionRecord, TaskStatus
+    
+    logger.info("Task starting: {} [{}]", task.name, task_id)
+    _task_started[task_id] = time.monotonic()
     
-    logger.info(f"Task starting: {task.name} [{task_id}]")
+    # Running count on the worker status, lowered again in postrun
+    from .worker_manager import worker_manager
+    worker_manager.update_task_count(1)
     
     # Create execution record
     try:
@@ -136,7 +196,7 @@ def task_prerun_handler(sender=None, task_id=None, task=None, args=None, kwargs=
             input_data={"args": args, "kwargs": kwargs}
         )
         
-        db_ops.create_execution_record(execution_record)
+        db_ops.queue_execution_record(execution_record)
         
     except Exception as e:
         logger.error(f"Failed to create execution record: {e}")
@@ -146,10 +206,16 @@ def task_prerun_handler(sender=None, task_id=None, task=None, args=None, kwargs=
 def task_postrun_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, retval=None, state=None, **kw):
     """Handle task postrun signal"""
     from datetime import datetime
-    from ..core.database.operations import db_ops
-    from ..core.database.models import TaskStatus
+    from core.database.operations import db_ops
+    from core.database.models import TaskStatus
+    
+    logger.info("Task completed: {} [{}] - {}", task.name, task_id, state)
     
-    logger.info(f"Task completed: {task.name} [{task_id}] - {state}")
+    # postrun is the last signal for a task, so forget it here
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        from .worker_manager import worker_manager
+        worker_manager.update_task_count(-1)
     
     # Update execution record
     try:
@@ -160,12 +226,10 @@ def task_postrun_handler(sender=None, task_id=None, task=None, args=None, kwargs
         }
         
         # Calculate duration
-        execution_record = db_ops.get_execution_record(task_id)
-        if execution_record and execution_record.started_at:
-            duration = (datetime.utcnow() - execution_record.started_at).total_seconds()
-            updates["duration"] = duration
+        if started is not None:
+            updates["duration"] = time.monotonic() - started
         
-        db_ops.update_execution_record(task_id, updates)
+        db_ops.queue_execution_update(task_id, updates)
         
     except Exception as e:
         logger.error(f"Failed to update execution record: {e}")
@@ -175,8 +239,8 @@ def task_postrun_handler(sender=None, task_id=None, task=None, args=None, kwargs
 def task_failure_handler(sender=None, task_id=None, exception=None, traceback=None, einfo=None, **kw):
     """Handle task failure signal"""
     from datetime import datetime
-    from ..core.database.operations import db_ops
-    from ..core.database.models import TaskStatus
+    from core.database.operations import db_ops
+    from core.database.models import TaskStatus
     
     logger.error(f"Task failed: {sender.name} [{task_id}] - {exception}")
     
@@ -190,12 +254,11 @@ def task_failure_handler(sender=None, task_id=None, exception=None, traceback=No
         }
         
         # Calculate duration
-        execution_record = db_ops.get_execution_record(task_id)
-        if execution_record and execution_record.started_at:
-            duration = (datetime.utcnow() - execution_record.started_at).total_seconds()
-            updates["duration"] = duration
+        started = _task_started.get(task_id)
+        if started is not None:
+            updates["duration"] = time.monotonic() - started
         
-        db_ops.update_execution_record(task_id, updates)
+        db_ops.queue_execution_update(task_id, updates)
         
     except Exception as e:
         logger.error(f"Failed to update execution record on failure: {e}")
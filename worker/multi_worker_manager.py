@@ -2,12 +2,14 @@
 Multi-Worker Manager for task-specific workers
 """
 import os
+import re
 import sys
 import subprocess
 import signal
+import threading
 import time
 import psutil
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from pathlib import Path
 from loguru import logger
 
@@ -15,14 +17,70 @@ from core.config.manager import get_config
 from core.database.operations import db_ops
 
 
+_AFFINITY_ITEM = re.compile(r'\[([^\]]*)\](?::(\d+))?|([^,\s]+)')
+
+
+def _expand_cpu_list(spec: str) -> List[int]:
+    """Expand "0,2,4-7" into a list of CPU ids"""
+    cpus = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(x) for x in part.split('-', 1))
+            if end < start:
+                raise ValueError(f"Invalid CPU range: {part}")
+            cpus.extend(range(start, end + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def parse_cpu_affinity(spec: Optional[str]) -> List[Set[int]]:
+    """
+    Parse CPU affinity spec into one CPU set per worker
+    
+    "3" pins one worker to CPU 3, "3-5" pins one worker to each of
+    CPUs 3, 4 and 5, and "[0-7]:4" lets four workers share CPUs 0-7.
+    Items are comma-separated, e.g. "1,2,3-5,[8-15]:2".
+    
+    Args:
+        spec: Affinity specification string
+        
+    Returns:
+        List of CPU sets, one per worker slot
+    """
+    if not spec:
+        return []
+    
+    cpu_sets: List[Set[int]] = []
+    for match in _AFFINITY_ITEM.finditer(spec):
+        group, count, single = match.groups()
+        if group is not None:
+            cpus = set(_expand_cpu_list(group))
+            if not cpus:
+                raise ValueError(f"Empty CPU group in affinity spec: {spec}")
+            cpu_sets.extend(cpus for _ in range(int(count or 1)))
+        else:
+            cpu_sets.extend({cpu} for cpu in _expand_cpu_list(single))
+    return cpu_sets
+
+
 class TaskWorker:
     """Individual task worker process"""
     
-    def __init__(self, task_id: str, config: Dict[str, Any]):
+    def __init__(self, task_id: str, config: Dict[str, Any], cpu_affinity: Optional[Set[int]] = None):
         self.task_id = task_id
         self.config = config
+        self.cpu_affinity = cpu_affinity
         self.process: Optional[subprocess.Popen] = None
         self.worker_name = f"{task_id}_worker"
+        self._stop_requested = False
+    
+    def _pin_cpus(self):
+        """Pin the worker process to its CPU set (runs in the child before exec)"""
+        os.sched_setaffinity(0, self.cpu_affinity)
         
     def start(self) -> bool:
         """Start the task worker process"""
@@ -49,11 +107,19 @@ class TaskWorker:
             
             logger.info(f"Starting worker for task {self.task_id}: {' '.join(cmd)}")
             
+            # Pin before exec so Celery's forked pool children inherit the CPU set
+            preexec_fn = None
+            if self.cpu_affinity and hasattr(os, 'sched_setaffinity'):
+                preexec_fn = self._pin_cpus
+                logger.info(f"Pinning task worker {self.task_id} to CPUs {sorted(self.cpu_affinity)}")
+            
+            self._stop_requested = False
             self.process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                preexec_fn=preexec_fn
             )
             
             # Wait a bit to check if process started successfully
@@ -70,12 +136,18 @@ class TaskWorker:
             logger.error(f"Failed to start task worker {self.task_id}: {e}")
             return False
     
+    def request_stop(self):
+        """Send the termination signal once, without waiting for exit"""
+        if self.process and self.process.poll() is None and not self._stop_requested:
+            self.process.terminate()
+            self._stop_requested = True
+    
     def stop(self) -> bool:
         """Stop the task worker process"""
         try:
             if self.process and self.process.poll() is None:
                 # Graceful shutdown
-                self.process.terminate()
+                self.request_stop()
                 
                 # Wait for graceful shutdown
                 try:
@@ -105,6 +177,7 @@ class TaskWorker:
             "worker_name": self.worker_name,
             "is_alive": self.is_alive(),
             "pid": self.process.pid if self.process else None,
+            "cpu_affinity": sorted(self.cpu_affinity) if self.cpu_affinity else None,
             "config": self.config
         }
         
@@ -129,6 +202,21 @@ class MultiWorkerManager:
     def __init__(self):
         self.task_workers: Dict[str, TaskWorker] = {}
         self.config = get_config()
+        self._stop_all_lock = threading.Lock()
+        self._affinity_slot = 0
+        try:
+            self._cpu_affinity = parse_cpu_affinity(self.config.worker.cpu_affinity)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid cpu_affinity setting: {e}")
+            self._cpu_affinity = []
+    
+    def _next_cpu_affinity(self) -> Optional[Set[int]]:
+        """Get CPU set for the next worker, round-robin over configured slots"""
+        if not self._cpu_affinity:
+            return None
+        cpus = self._cpu_affinity[self._affinity_slot % len(self._cpu_affinity)]
+        self._affinity_slot += 1
+        return cpus
         
     def get_task_worker_config(self, task_id: str) -> Dict[str, Any]:
         """Get worker configuration for specific task"""
@@ -176,7 +264,7 @@ class MultiWorkerManager:
             worker_config = self.get_task_worker_config(task_id)
             
             # Create and start worker
-            worker = TaskWorker(task_id, worker_config)
+            worker = TaskWorker(task_id, worker_config, self._next_cpu_affinity())
             if worker.start():
                 self.task_workers[task_id] = worker
                 return True
@@ -224,12 +312,21 @@ class MultiWorkerManager:
     
     def stop_all_task_workers(self) -> bool:
         """Stop all task workers"""
+        # A signal arriving while a stop is already running must not start a second one
+        if not self._stop_all_lock.acquire(blocking=False):
+            logger.info("Stop already in progress")
+            return False
+        
         try:
             workers_to_stop = list(self.task_workers.keys())
             success_count = 0
             
             logger.info(f"Stopping {len(workers_to_stop)} task workers")
             
+            # Signal every worker first so they shut down in parallel
+            for task_id in workers_to_stop:
+                self.task_workers[task_id].request_stop()
+            
             for task_id in workers_to_stop:
                 if self.stop_task_worker(task_id):
                     success_count += 1
@@ -240,6 +337,8 @@ class MultiWorkerManager:
         except Exception as e:
             logger.error(f"Failed to stop all task workers: {e}")
             return False
+        finally:
+            self._stop_all_lock.release()
     
     def restart_task_worker(self, task_id: str) -> bool:
         """Restart worker for specific task"""
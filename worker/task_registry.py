@@ -1,29 +1,40 @@
 """
 Dynamic task registration for Celery worker
 """
-import uuid
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 
 from .celery_app import celery_app, ai_task
 from core.config.manager import get_config
 from core.task_loader.loader import task_loader
 from core.database.operations import db_ops
-from core.database.models import ExecutionRecord, TaskStatus, TaskType
+from core.database.models import ExecutionRecord, TaskStatus, TaskType, new_execution_id
 from pipeline.executor import pipeline_executor
 
 
 class TaskRegistry:
     """Registry for dynamic task registration"""
     
+    # Seconds an info view is reused; metadata can change in the database
+    # without the task being re-registered
+    info_cache_ttl = 30.0
+    
     def __init__(self):
         self.registered_tasks: Dict[str, Any] = {}
         self.registered_pipelines: Dict[str, Any] = {}
+        # (expiry, info) views, dropped on (re)registration or after info_cache_ttl
+        self._task_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._pipeline_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
     
     def load_and_register_tasks(self):
         """Load and register all active tasks and pipelines"""
         config = get_config().worker
         
+        # Fetch packages concurrently; registration then hits the loader's memory cache
+        task_loader.load_tasks(config.active_tasks)
+        task_loader.load_pipelines(config.active_pipelines)
+        
         # Load and register tasks
         for task_id in config.active_tasks:
             self.register_task(task_id)
@@ -60,15 +71,15 @@ class TaskRegistry:
             def task_function(input_data: Any, execution_id: Optional[str] = None):
                 """Dynamic task execution function"""
                 if not execution_id:
-                    execution_id = str(uuid.uuid4())
+                    execution_id = new_execution_id()
                 
                 try:
-                    logger.info(f"Executing task {task_id} with execution_id: {execution_id}")
+                    logger.info("Executing task {} with execution_id: {}", task_id, execution_id)
                     
                     # Execute task
                     result = task_instance.process(input_data)
                     
-                    logger.info(f"Task {task_id} completed successfully")
+                    logger.info("Task {} completed successfully", task_id)
                     return {
                         "execution_id": execution_id,
                         "task_id": task_id,
@@ -90,6 +101,7 @@ class TaskRegistry:
             )(task_function)
             
             self.registered_tasks[task_id] = registered_task
+            self._task_info_cache.pop(task_id, None)
             logger.info(f"Registered task: {task_id} on queue: {queue}")
             return True
             
@@ -124,10 +136,10 @@ class TaskRegistry:
             def pipeline_function(input_data: Any, execution_id: Optional[str] = None):
                 """Dynamic pipeline execution function"""
                 if not execution_id:
-                    execution_id = str(uuid.uuid4())
+                    execution_id = new_execution_id()
                 
                 try:
-                    logger.info(f"Executing pipeline {pipeline_id} with execution_id: {execution_id}")
+                    logger.info("Executing pipeline {} with execution_id: {}", pipeline_id, execution_id)
                     
                     # Execute pipeline
                     result = pipeline_executor.execute_pipeline(
@@ -136,7 +148,7 @@ class TaskRegistry:
                         execution_id
                     )
                     
-                    logger.info(f"Pipeline {pipeline_id} completed successfully")
+                    logger.info("Pipeline {} completed successfully", pipeline_id)
                     return {
                         "execution_id": execution_id,
                         "pipeline_id": pipeline_id,
@@ -157,6 +169,7 @@ class TaskRegistry:
             )(pipeline_function)
             
             self.registered_pipelines[pipeline_id] = registered_pipeline
+            self._pipeline_info_cache.pop(pipeline_id, None)
             logger.info(f"Registered pipeline: {pipeline_id} on queue: {queue}")
             return True
             
@@ -177,6 +190,7 @@ class TaskRegistry:
         try:
             if task_id in self.registered_tasks:
                 del self.registered_tasks[task_id]
+                self._task_info_cache.pop(task_id, None)
                 # Unload from task loader
                 task_loader.unload_task(task_id)
                 logger.info(f"Unregistered task: {task_id}")
@@ -200,6 +214,7 @@ class TaskRegistry:
         try:
             if pipeline_id in self.registered_pipelines:
                 del self.registered_pipelines[pipeline_id]
+                self._pipeline_info_cache.pop(pipeline_id, None)
                 # Unload from task loader
                 task_loader.unload_pipeline(pipeline_id)
                 logger.info(f"Unregistered pipeline: {pipeline_id}")
@@ -280,13 +295,13 @@ class TaskRegistry:
                 return None
             
             # Generate execution ID
-            execution_id = str(uuid.uuid4())
+            execution_id = new_execution_id()
             
             # Submit to Celery
             task = self.registered_tasks[task_id]
             result = task.delay(input_data, execution_id, **kwargs)
             
-            logger.info(f"Submitted task {task_id} with execution_id: {execution_id}, celery_id: {result.id}")
+            logger.info("Submitted task {} with execution_id: {}, celery_id: {}", task_id, execution_id, result.id)
             return execution_id
             
         except Exception as e:
@@ -311,13 +326,13 @@ class TaskRegistry:
                 return None
             
             # Generate execution ID
-            execution_id = str(uuid.uuid4())
+            execution_id = new_execution_id()
             
             # Submit to Celery
             pipeline = self.registered_pipelines[pipeline_id]
             result = pipeline.delay(input_data, execution_id, **kwargs)
             
-            logger.info(f"Submitted pipeline {pipeline_id} with execution_id: {execution_id}, celery_id: {result.id}")
+            logger.info("Submitted pipeline {} with execution_id: {}, celery_id: {}", pipeline_id, execution_id, result.id)
             return execution_id
             
         except Exception as e:
@@ -330,6 +345,11 @@ class TaskRegistry:
             if not self.is_task_registered(task_id):
                 return None
             
+            now = time.monotonic()
+            cached = self._task_info_cache.get(task_id)
+            if cached and cached[0] > now:
+                return dict(cached[1])
+            
             # Get metadata from database
             metadata = db_ops.get_task_metadata(task_id)
             if not metadata:
@@ -338,7 +358,7 @@ class TaskRegistry:
             # Get task configuration
             task_config = get_config().worker.task_configs.get(task_id)
             
-            return {
+            info = {
                 "task_id": task_id,
                 "name": metadata.name,
                 "description": metadata.description,
@@ -350,6 +370,8 @@ class TaskRegistry:
                 "is_registered": True,
                 "is_active": metadata.is_active
             }
+            self._task_info_cache[task_id] = (now + self.info_cache_ttl, info)
+            return dict(info)
             
         except Exception as e:
             logger.error(f"Failed to get task info {task_id}: {e}")
@@ -361,6 +383,11 @@ class TaskRegistry:
             if not self.is_pipeline_registered(pipeline_id):
                 return None
             
+            now = time.monotonic()
+            cached = self._pipeline_info_cache.get(pipeline_id)
+            if cached and cached[0] > now:
+                return self._copy_pipeline_info(cached[1])
+            
             # Get metadata from database
             metadata = db_ops.get_pipeline_metadata(pipeline_id)
             if not metadata:
@@ -369,7 +396,7 @@ class TaskRegistry:
             # Get pipeline configuration
             pipeline_config = get_config().worker.pipeline_configs.get(pipeline_id)
             
-            return {
+            info = {
                 "pipeline_id": pipeline_id,
                 "name": metadata.name,
                 "description": metadata.description,
@@ -384,10 +411,17 @@ class TaskRegistry:
                 "is_registered": True,
                 "is_active": metadata.is_active
             }
+            self._pipeline_info_cache[pipeline_id] = (now + self.info_cache_ttl, info)
+            return self._copy_pipeline_info(info)
             
         except Exception as e:
             logger.error(f"Failed to get pipeline info {pipeline_id}: {e}")
             return None
+    
+    @staticmethod
+    def _copy_pipeline_info(info: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached pipeline info view, including its task list"""
+        return {**info, "tasks": list(info["tasks"])}
 
 
 # Global task registry instance
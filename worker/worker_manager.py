@@ -23,9 +23,18 @@ class WorkerManager:
         self.config = get_config().worker
         self.worker_id = self.config.worker_id
         self.hostname = socket.gethostname()
-        self.is_running = False
         self.heartbeat_thread: Optional[threading.Thread] = None
         self.heartbeat_interval = self.config.health_check_interval
+        # Workers are listed as active while their heartbeat is younger than
+        # this window (see DatabaseOperations.list_active_workers)
+        self.heartbeat_ttl = 5 * 60
+        # Longest gap between heartbeat writes; a fifth of the window, so a live
+        # worker survives several lost unacknowledged writes plus scheduling jitter
+        self.heartbeat_max_age = self.heartbeat_ttl / 5
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._heartbeat_dirty = False
+        self._last_heartbeat = 0.0
         
     def register_worker(self) -> bool:
         """Register worker with the system"""
@@ -56,6 +65,8 @@ class WorkerManager:
             success = db_ops.update_worker_status(worker_status)
             if success:
                 logger.info(f"Worker {self.worker_id} registered successfully")
+                # Registration is the first heartbeat; don't repeat it immediately
+                self._last_heartbeat = time.monotonic()
                 self._start_heartbeat()
                 return True
             else:
@@ -97,37 +108,58 @@ class WorkerManager:
         if self.heartbeat_thread and self.heartbeat_thread.is_alive():
             return
         
-        self.is_running = True
+        self._stop_event.clear()
+        self._wake_event.clear()
         self.heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
         self.heartbeat_thread.start()
         logger.info("Heartbeat thread started")
     
     def _stop_heartbeat(self):
         """Stop heartbeat thread"""
-        self.is_running = False
+        self._stop_event.set()
+        self._wake_event.set()
         if self.heartbeat_thread and self.heartbeat_thread.is_alive():
             self.heartbeat_thread.join(timeout=5)
         logger.info("Heartbeat thread stopped")
     
+    def notify_state_change(self):
+        """Mark worker state as changed and wake the heartbeat thread"""
+        self._heartbeat_dirty = True
+        self._wake_event.set()
+    
+    def _heartbeat_due(self) -> bool:
+        """Check if a heartbeat write is needed"""
+        if self._heartbeat_dirty:
+            return True
+        return time.monotonic() - self._last_heartbeat >= self.heartbeat_max_age
+    
     def _heartbeat_loop(self):
         """Heartbeat loop to update worker status"""
-        while self.is_running:
+        while not self._stop_event.is_set():
             try:
-                self._send_heartbeat()
-                time.sleep(self.heartbeat_interval)
+                if self._heartbeat_due():
+                    self._send_heartbeat()
             except Exception as e:
                 logger.error(f"Heartbeat error: {e}")
-                time.sleep(5)  # Wait a bit before retrying
+            
+            # Sleep until the next interval, a state change or shutdown
+            self._wake_event.wait(self.heartbeat_interval)
+            self._wake_event.clear()
     
     def _send_heartbeat(self):
         """Send heartbeat update"""
         try:
+            self._heartbeat_dirty = False
+            
             # Get current statistics
             stats = self._get_worker_statistics()
             
+            # current_task_count is owned by update_task_count, called from the
+            # task_prerun/task_postrun handlers; the cached statistics would
+            # overwrite its atomic result
             updates = {
+                "is_active": True,
                 "last_heartbeat": datetime.utcnow(),
-                "current_task_count": stats.get("current_tasks", 0),
                 "memory_usage": self._get_memory_usage(),
                 "cpu_usage": self._get_cpu_usage(),
                 "total_tasks_executed": stats.get("total_executed", 0),
@@ -141,7 +173,8 @@ class WorkerManager:
                 **updates
             )
             
-            db_ops.update_worker_status(worker_status)
+            if db_ops.update_worker_status(worker_status, acknowledged=False):
+                self._last_heartbeat = time.monotonic()
             
         except Exception as e:
             logger.error(f"Failed to send heartbeat: {e}")
@@ -247,13 +280,8 @@ class WorkerManager:
                 "failed": 0
             }
             
-            # Get execution records for this worker
-            records = db_ops.list_execution_records(worker_id=self.worker_id, limit=1000)
-            
-            stats["total_executed"] = len(records)
-            stats["successful"] = len([r for r in records if r.status.value == "success"])
-            stats["failed"] = len([r for r in records if r.status.value == "failed"])
-            stats["current_tasks"] = len([r for r in records if r.status.value == "running"])
+            # Count execution records for this worker server-side
+            stats.update(db_ops.get_worker_statistics(self.worker_id))
             
             return stats
             
@@ -301,17 +329,9 @@ class WorkerManager:
     def update_task_count(self, increment: int = 0):
         """Update current task count"""
         try:
-            worker_status = db_ops.get_worker_status(self.worker_id)
-            if worker_status:
-                new_count = max(0, worker_status.current_task_count + increment)
-                updates = {"current_task_count": new_count}
-                
-                updated_status = WorkerStatus(
-                    worker_id=self.worker_id,
-                    hostname=self.hostname,
-                    **updates
-                )
-                db_ops.update_worker_status(updated_status)
+            # Read-modify-write in one server-side step, so concurrent updates can't lose counts
+            if db_ops.adjust_worker_task_count(self.worker_id, increment):
+                self.notify_state_change()
                 
         except Exception as e:
             logger.error(f"Failed to update task count: {e}")